@@ -9,6 +9,7 @@ This module is imported by other scripts for command construction.
 
 import re
 import struct
+from functools import lru_cache
 from typing import Union, Tuple
 
 
@@ -88,18 +89,6 @@ def build_command(
     Raises:
         ValueError: On invalid parameters or data.
     """
-    # Validate frame header
-    if frame_header not in ('#TP', '#tp', '#tP', '#Tp'):
-        raise ValueError(f"Unsupported frame header: {frame_header}")
-    
-    # Validate addresses
-    if len(address_bit1) != 1 or len(address_bit2) != 1:
-        raise ValueError("Address bits must be single characters.")
-    
-    # Validate identifier
-    if len(identifier_bit) != 3:
-        raise ValueError("Identifier bit must be exactly 3 characters.")
-    
     # Convert data based on mode
     if data_mode == 'ASCII':
         data_bytes = data.encode('ascii')
@@ -113,7 +102,66 @@ def build_command(
     else:
         raise ValueError(f"Unsupported data_mode: {data_mode}")
     
-    data_length = len(data_bytes)
+    cmd = build_command_bytes(frame_header, address_bit1, address_bit2,
+                              control_bit, identifier_bit, data_bytes)
+    
+    # Format output
+    if output_format == 'ASCII':
+        try:
+            return cmd.decode('ascii')
+        except UnicodeDecodeError:
+            raise ValueError("Command contains non-ASCII bytes; choose hex output.")
+    elif output_format == 'Hex':
+        hexstr = cmd.hex().upper()
+        if output_space_separate:
+            return ' '.join(hexstr[i:i+2] for i in range(0, len(hexstr), 2))
+        return hexstr
+    else:
+        raise ValueError(f"Unsupported output_format: {output_format}")
+
+
+def build_command_bytes(
+    frame_header: str,
+    address_bit1: str,
+    address_bit2: str,
+    control_bit: str,
+    identifier_bit: str,
+    data: bytes
+) -> bytes:
+    """
+    Assemble a command frame from a raw binary payload.
+
+    Same framing and CRC as build_command, but takes the payload as bytes
+    and returns the frame as bytes, so binary payloads (e.g. LOC) need no
+    hex-string round trip.
+
+    Parameters:
+        frame_header: One of '#TP', '#tp', '#tP', '#Tp'
+        address_bit1: Single letter source code
+        address_bit2: Single letter destination code
+        control_bit: 'w' for write or 'r' for read (ignored for '#Tp')
+        identifier_bit: Three-character command identifier
+        data: Payload bytes
+
+    Returns:
+        The assembled command frame including CRC.
+
+    Raises:
+        ValueError: On invalid parameters or data length.
+    """
+    # Validate frame header
+    if frame_header not in ('#TP', '#tp', '#tP', '#Tp'):
+        raise ValueError(f"Unsupported frame header: {frame_header}")
+    
+    # Validate addresses
+    if len(address_bit1) != 1 or len(address_bit2) != 1:
+        raise ValueError("Address bits must be single characters.")
+    
+    # Validate identifier
+    if len(identifier_bit) != 3:
+        raise ValueError("Identifier bit must be exactly 3 characters.")
+    
+    data_length = len(data)
     
     # Determine length bytes based on frame header
     if frame_header == '#TP':
@@ -152,25 +200,25 @@ def build_command(
     
     # Add identifier and data
     cmd.extend(identifier_bit.encode('ascii'))
-    cmd.extend(data_bytes)
+    cmd.extend(data)
     
     # Calculate and add CRC
     crc_val = calculate_crc(cmd)
     cmd.extend(f"{crc_val:02X}".encode('ascii'))
     
-    # Format output
-    if output_format == 'ASCII':
-        try:
-            return cmd.decode('ascii')
-        except UnicodeDecodeError:
-            raise ValueError("Command contains non-ASCII bytes; choose hex output.")
-    elif output_format == 'Hex':
-        hexstr = cmd.hex().upper()
-        if output_space_separate:
-            return ' '.join(hexstr[i:i+2] for i in range(0, len(hexstr), 2))
-        return hexstr
-    else:
-        raise ValueError(f"Unsupported output_format: {output_format}")
+    return bytes(cmd)
+
+
+@lru_cache(maxsize=128)
+def build_command_cached(*args, **kwargs) -> str:
+    """
+    Memoized build_command for commands that are sent repeatedly
+
+    Takes the same arguments as build_command. All arguments are strings or
+    booleans, so fixed commands (e.g. the GAC attitude read) are assembled
+    and checksummed only once per process.
+    """
+    return build_command(*args, **kwargs)
 
 
 def parse_command_response(response: bytes) -> dict:
@@ -6,6 +6,8 @@ Test gimbal commands with detailed logging and verification.
 Based on protocol documentation and sample commands.
 """
 
+import binascii
+import select
 import socket
 import time
 import struct
@@ -13,33 +15,117 @@ from datetime import datetime
 from config import GIMBAL_CONFIG
 
 
+# Response frame header: header(3) addresses(2) length(1) control(1) identifier(3)
+_FRAME_HDR = struct.Struct('3s2scc3s')
+_HEX_DIGITS = b'0123456789ABCDEF'
+
+# Hex-encoded signed 16-bit fields: attitude (yaw, pitch, roll) and zoom
+_ATT_STRUCT = struct.Struct('>hhh')
+_INT16 = struct.Struct('>h')
+
+
+def _text(field):
+    """Render a raw response field for the log"""
+    return field.decode('ascii', errors='replace')
+
+
+def _data_offset(resp_ascii, identifier):
+    """
+    Locate the data field that follows a 3-char identifier in a response
+
+    The identifier normally sits at the fixed offset 7, so that is checked
+    first; malformed or prefixed packets fall back to a search.
+    Returns None if the identifier is absent.
+    """
+    if not resp_ascii:
+        return None
+    if resp_ascii[7:10] == identifier:
+        return 10
+    idx = resp_ascii.find(identifier)
+    return idx + 3 if idx != -1 else None
+
+
+def _parse_yaw(resp_ascii):
+    """Return the yaw (degrees) from a GAC response, or None"""
+    idx = _data_offset(resp_ascii, 'GAC')
+    if idx is None:
+        return None
+    try:
+        yaw, = _INT16.unpack(bytes.fromhex(resp_ascii[idx:idx+4]))
+    except (ValueError, struct.error):
+        return None
+    return yaw / 100.0
+
+
+# GAC read (magnetic attitude), from test_connection.py success
+ATTITUDE_CMD = b"#TPPG2rGAC002D"
+
+RESPONSE_TIMEOUT = 2.0       # seconds to wait for a command response
+
+# Movement verification: poll attitude until the yaw moves this far
+MOVE_DETECT_THRESHOLD = 2.0  # degrees
+MOVE_POLL_INTERVAL = 0.1     # seconds
+MOVE_MAX_WAIT = 2.0          # seconds
+
+# Commands from GimbalUdpControlDemo.py comments
+SAMPLE_COMMANDS = tuple(
+    (f"Sample command: {desc}", cmd) for desc, cmd in (
+        ("Capture photo", b"#TPUD2wCAP013E"),
+        ("Toggle recording", b"#TPUD2wREC0A54"),
+        ("Gimbal up", b"#TPUG2wPTZ016B"),
+        ("Gimbal down", b"#TPUG2wPTZ026C"),
+        ("Gimbal left", b"#TPUG2wPTZ036D"),
+        ("Gimbal right", b"#TPUG2wPTZ046E"),
+        ("Gimbal stop", b"#TPUG2wPTZ006A"),
+        ("Gimbal home", b"#TPUG2wPTZ056F"),
+    )
+)
+
+
 class DetailedCommandTester:
     def __init__(self):
         self.camera_ip = GIMBAL_CONFIG['camera_ip']
         self.control_port = GIMBAL_CONFIG['control_port']
         self.listen_port = GIMBAL_CONFIG['listen_port']
+        self.dest = (self.camera_ip, self.control_port)
         
         # Create sockets
         self.send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.recv_sock.bind(('0.0.0.0', self.listen_port))
-        self.recv_sock.settimeout(2.0)
+        self.recv_sock.settimeout(RESPONSE_TIMEOUT)
         
-        self.log_file = open(f"command_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log", 'w')
+        # Reusable receive buffer so responses are not allocated per recv
+        self._recvbuf = bytearray(1024)
+        self._recvmv = memoryview(self._recvbuf)
+        
+        # Line buffered: every completed log line reaches the file
+        self.log_file = open(f"command_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log", 'w',
+                             buffering=1)
         
     def log(self, message):
         """Log to console and file"""
         timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
         log_entry = f"[{timestamp}] {message}"
         print(log_entry)
-        self.log_file.write(log_entry + '\n')
-        self.log_file.flush()
+        self.log_file.write(log_entry)
+        self.log_file.write('\n')
+    
+    def log_banner(self, title, width=80):
+        """Log a section banner (blank line, rule, title, rule) in one write"""
+        timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
+        rule = '=' * width
+        banner = (
+            f"[{timestamp}] \n{rule}\n",
+            f"[{timestamp}] {title}\n",
+            f"[{timestamp}] {rule}\n",
+        )
+        print(''.join(banner), end='')
+        self.log_file.writelines(banner)
         
     def send_raw_command(self, cmd_bytes, description=""):
         """Send raw command bytes and log everything"""
-        self.log(f"\n{'='*60}")
-        self.log(f"TEST: {description}")
-        self.log(f"{'='*60}")
+        self.log_banner(f"TEST: {description}", 60)
         
         # Log command details
         self.log(f"Command bytes (hex): {cmd_bytes.hex()}")
@@ -53,192 +139,196 @@ class DetailedCommandTester:
             pass
             
         # Send command
-        self.send_sock.sendto(cmd_bytes, (self.camera_ip, self.control_port))
+        self.send_sock.sendto(cmd_bytes, self.dest)
         self.log(f"Sent to {self.camera_ip}:{self.control_port}")
         
         # Wait for response
         try:
-            response, addr = self.recv_sock.recvfrom(1024)
+            nbytes, addr = self.recv_sock.recvfrom_into(self._recvbuf, 1024)
+            mv = self._recvmv[:nbytes]
             self.log(f"\nResponse from {addr}:")
-            self.log(f"Response bytes (hex): {response.hex()}")
-            self.log(f"Response length: {len(response)} bytes")
+            self.log(f"Response bytes (hex): {mv.hex()}")
+            self.log(f"Response length: {nbytes} bytes")
             
             # Decode response
             try:
-                resp_ascii = response.decode('ascii', errors='replace')
+                resp_ascii = str(mv, 'ascii', errors='replace')
                 self.log(f"Response ASCII: {resp_ascii}")
                 
-                # Parse response structure
-                if len(resp_ascii) > 10:
+                # Parse response structure straight from the raw bytes;
+                # fields are only turned into text when they are logged
+                if nbytes > 10:
+                    header, addresses, length_char, control, ident = _FRAME_HDR.unpack_from(mv, 0)
                     self.log("\nResponse breakdown:")
-                    self.log(f"  Frame header: {resp_ascii[0:3]}")
-                    self.log(f"  Addresses: {resp_ascii[3:5]}")
-                    if '#tp' in resp_ascii:
-                        length_char = resp_ascii[5]
-                        self.log(f"  Data length: {length_char} ({int(length_char, 16)} bytes)")
-                        self.log(f"  Control bit: {resp_ascii[6]}")
-                        self.log(f"  Identifier: {resp_ascii[7:10]}")
-                        data_len = int(length_char, 16) if length_char in '0123456789ABCDEF' else 0
+                    self.log(f"  Frame header: {_text(header)}")
+                    self.log(f"  Addresses: {_text(addresses)}")
+                    if header == b'#tp':
+                        data_len = int(length_char, 16) if length_char in _HEX_DIGITS else 0
+                        self.log(f"  Data length: {_text(length_char)} ({data_len} bytes)")
+                        self.log(f"  Control bit: {_text(control)}")
+                        self.log(f"  Identifier: {_text(ident)}")
                         if data_len > 0:
-                            self.log(f"  Data: {resp_ascii[10:10+data_len]}")
-                    self.log(f"  CRC: {resp_ascii[-2:]}")
+                            data = bytes(mv[10:10+data_len])
+                            self.log(f"  Data: {_text(data)}")
+                    crc = bytes(mv[-2:])
+                    self.log(f"  CRC: {_text(crc)}")
                     
-                return response, resp_ascii
+                # Callers keep the response after the buffer is reused
+                return bytes(mv), resp_ascii
             except Exception as e:
                 self.log(f"Error parsing response: {e}")
-                return response, None
+                return bytes(mv), None
                 
         except socket.timeout:
             self.log("No response received (timeout)")
             return None, None
     
+    def _drain_responses(self):
+        """Discard queued datagrams so they are not taken as the next reply"""
+        while select.select([self.recv_sock], [], [], 0)[0]:
+            self.recv_sock.recv_into(self._recvbuf)
+    
+    def _quick_attitude(self, timeout=RESPONSE_TIMEOUT):
+        """
+        Query GAC and return (yaw, pitch, roll) in degrees, or None
+
+        Unlike send_raw_command this does no logging, for loops that only
+        need the numbers. Datagrams already queued (e.g. a late PTZ ack)
+        are discarded first, and anything other than a GAC reply is skipped
+        while waiting, so a stray frame is never read as the attitude.
+
+        Args:
+            timeout: Seconds to wait for the GAC reply
+        """
+        self._drain_responses()
+        self.send_sock.sendto(ATTITUDE_CMD, self.dest)
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self.recv_sock], [], [], remaining)[0]:
+                return None
+            nbytes = self.recv_sock.recv_into(self._recvbuf)
+            
+            mv = self._recvmv[:nbytes]
+            if mv[7:10] == b'GAC':
+                idx = 10
+            else:
+                idx = self._recvbuf.find(b'GAC', 0, nbytes)
+                if idx == -1:
+                    continue  # Some other frame; keep waiting
+                idx += 3
+            
+            try:
+                yaw, pitch, roll = _ATT_STRUCT.unpack(binascii.unhexlify(mv[idx:idx+12]))
+            except (binascii.Error, struct.error):
+                return None
+            return yaw / 100.0, pitch / 100.0, roll / 100.0
+    
     def test_exact_sample_commands(self):
         """Test exact commands from the sample code"""
-        self.log("\n" + "="*80)
-        self.log("TESTING EXACT SAMPLE COMMANDS FROM DOCUMENTATION")
-        self.log("="*80)
-        
-        # Commands from GimbalUdpControlDemo.py comments
-        sample_commands = [
-            ("Capture photo", b"#TPUD2wCAP013E"),
-            ("Toggle recording", b"#TPUD2wREC0A54"),
-            ("Gimbal up", b"#TPUG2wPTZ016B"),
-            ("Gimbal down", b"#TPUG2wPTZ026C"),
-            ("Gimbal left", b"#TPUG2wPTZ036D"),
-            ("Gimbal right", b"#TPUG2wPTZ046E"),
-            ("Gimbal stop", b"#TPUG2wPTZ006A"),
-            ("Gimbal home", b"#TPUG2wPTZ056F"),
-        ]
+        self.log_banner("TESTING EXACT SAMPLE COMMANDS FROM DOCUMENTATION")
         
-        for desc, cmd in sample_commands:
-            self.send_raw_command(cmd, f"Sample command: {desc}")
+        # Each command still needs its own response and the inter-command
+        # delay, so only the loop-invariant work is hoisted out here.
+        for desc, cmd in SAMPLE_COMMANDS:
+            self.send_raw_command(cmd, desc)
             time.sleep(0.5)
     
     def test_attitude_reading(self):
         """Test attitude reading with verification"""
-        self.log("\n" + "="*80)
-        self.log("ATTITUDE READING TEST WITH VERIFICATION")
-        self.log("="*80)
+        self.log_banner("ATTITUDE READING TEST WITH VERIFICATION")
         
-        # Read attitude multiple times
+        # Read attitude multiple times; only the aggregate is logged
         attitudes = []
         for i in range(3):
-            cmd = b"#TPPG2rGAC002D"  # From test_connection.py success
-            response, resp_ascii = self.send_raw_command(cmd, f"Get Attitude #{i+1}")
-            
-            if resp_ascii and 'GAC' in resp_ascii:
-                try:
-                    idx = resp_ascii.find('GAC') + 3
-                    if idx + 12 <= len(resp_ascii):
-                        yaw_hex = resp_ascii[idx:idx+4]
-                        pitch_hex = resp_ascii[idx+4:idx+8]
-                        roll_hex = resp_ascii[idx+8:idx+12]
-                        
-                        yaw = int(yaw_hex, 16)
-                        pitch = int(pitch_hex, 16)
-                        roll = int(roll_hex, 16)
-                        
-                        # Handle signed values
-                        if yaw > 0x7FFF: yaw -= 0x10000
-                        if pitch > 0x7FFF: pitch -= 0x10000
-                        if roll > 0x7FFF: roll -= 0x10000
-                        
-                        attitude = {
-                            'yaw': yaw / 100.0,
-                            'pitch': pitch / 100.0,
-                            'roll': roll / 100.0
-                        }
-                        attitudes.append(attitude)
-                        
-                        self.log(f"\nParsed attitude:")
-                        self.log(f"  Yaw:   {attitude['yaw']:7.2f}° (hex: {yaw_hex})")
-                        self.log(f"  Pitch: {attitude['pitch']:7.2f}° (hex: {pitch_hex})")
-                        self.log(f"  Roll:  {attitude['roll']:7.2f}° (hex: {roll_hex})")
-                except Exception as e:
-                    self.log(f"Error parsing attitude: {e}")
-            
+            attitude = self._quick_attitude()
+            if attitude is not None:
+                attitudes.append(attitude)
             time.sleep(1)
         
+        self.log(f"\nParsed attitudes ({len(attitudes)}/3 readings):")
+        for i, (yaw, pitch, roll) in enumerate(attitudes, 1):
+            self.log(f"  #{i}: Yaw={yaw:7.2f}° Pitch={pitch:7.2f}° Roll={roll:7.2f}°")
+        
         # Check if attitude values change
         if len(attitudes) >= 2:
             self.log("\nAttitude stability check:")
             for i in range(1, len(attitudes)):
-                yaw_diff = abs(attitudes[i]['yaw'] - attitudes[i-1]['yaw'])
-                pitch_diff = abs(attitudes[i]['pitch'] - attitudes[i-1]['pitch'])
-                roll_diff = abs(attitudes[i]['roll'] - attitudes[i-1]['roll'])
+                yaw_diff, pitch_diff, roll_diff = (
+                    abs(cur - prev) for cur, prev in zip(attitudes[i], attitudes[i-1])
+                )
                 self.log(f"  Reading {i} to {i+1} differences: "
                         f"Yaw={yaw_diff:.2f}° Pitch={pitch_diff:.2f}° Roll={roll_diff:.2f}°")
     
     def test_movement_with_verification(self):
         """Test movement commands with attitude verification"""
-        self.log("\n" + "="*80)
-        self.log("MOVEMENT TEST WITH VERIFICATION")
-        self.log("="*80)
+        self.log_banner("MOVEMENT TEST WITH VERIFICATION")
         
         # Get initial attitude
-        cmd = b"#TPPG2rGAC002D"
+        cmd = ATTITUDE_CMD
         response, resp_ascii = self.send_raw_command(cmd, "Get initial attitude")
-        initial_yaw = None
+        initial_yaw = _parse_yaw(resp_ascii)
+        if initial_yaw is not None:
+            self.log(f"Initial yaw: {initial_yaw:.2f}°")
         
-        if resp_ascii and 'GAC' in resp_ascii:
-            try:
-                idx = resp_ascii.find('GAC') + 3
-                yaw_hex = resp_ascii[idx:idx+4]
-                initial_yaw = int(yaw_hex, 16)
-                if initial_yaw > 0x7FFF: initial_yaw -= 0x10000
-                initial_yaw = initial_yaw / 100.0
-                self.log(f"Initial yaw: {initial_yaw:.2f}°")
-            except:
-                pass
-        
-        # Move left
+        # Move left and poll until the yaw has visibly changed, instead of
+        # always waiting the full duration
         self.send_raw_command(b"#TPUG2wPTZ036D", "Move LEFT")
-        time.sleep(2)  # Let it move
+        move_start = time.monotonic()
+        if initial_yaw is None:
+            time.sleep(MOVE_MAX_WAIT)  # Nothing to compare against
+        else:
+            # Every wait is bounded by the deadline, so STOP goes out at most
+            # MOVE_MAX_WAIT after MOVE even if a reply never arrives
+            deadline = move_start + MOVE_MAX_WAIT
+            while True:
+                time.sleep(max(0.0, min(MOVE_POLL_INTERVAL, deadline - time.monotonic())))
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                attitude = self._quick_attitude(remaining)
+                if attitude is not None and abs(attitude[0] - initial_yaw) >= MOVE_DETECT_THRESHOLD:
+                    self.log(f"Movement detected after {time.monotonic() - move_start:.2f}s")
+                    break
         
-        # Stop
+        # Stop. The last poll may have given up just before its GAC reply
+        # arrived, so drop it rather than log it as the STOP response.
+        self._drain_responses()
         self.send_raw_command(b"#TPUG2wPTZ006A", "STOP movement")
         time.sleep(0.5)
         
-        # Get new attitude
+        # Get new attitude; a poll reply still in flight at STOP may have
+        # landed during the settle time
+        self._drain_responses()
         response, resp_ascii = self.send_raw_command(cmd, "Get attitude after movement")
+        new_yaw = _parse_yaw(resp_ascii)
         
-        if resp_ascii and 'GAC' in resp_ascii and initial_yaw is not None:
-            try:
-                idx = resp_ascii.find('GAC') + 3
-                yaw_hex = resp_ascii[idx:idx+4]
-                new_yaw = int(yaw_hex, 16)
-                if new_yaw > 0x7FFF: new_yaw -= 0x10000
-                new_yaw = new_yaw / 100.0
-                
-                yaw_change = new_yaw - initial_yaw
-                self.log(f"New yaw: {new_yaw:.2f}°")
-                self.log(f"Yaw change: {yaw_change:.2f}°")
-                
-                if abs(yaw_change) > 0.5:
-                    self.log("[OK] Movement verified - gimbal moved!")
-                else:
-                    self.log("[!] No significant movement detected")
-            except:
-                pass
+        if new_yaw is not None and initial_yaw is not None:
+            yaw_change = new_yaw - initial_yaw
+            self.log(f"New yaw: {new_yaw:.2f}°")
+            self.log(f"Yaw change: {yaw_change:.2f}°")
+            
+            if abs(yaw_change) > 0.5:
+                self.log("[OK] Movement verified - gimbal moved!")
+            else:
+                self.log("[!] No significant movement detected")
     
     def test_zoom_commands(self):
         """Test zoom commands with position verification"""
-        self.log("\n" + "="*80)
-        self.log("ZOOM TEST WITH VERIFICATION")
-        self.log("="*80)
+        self.log_banner("ZOOM TEST WITH VERIFICATION")
         
         # Get initial zoom position
         cmd = b"#TPUM2rZOM0063"
         response, resp_ascii = self.send_raw_command(cmd, "Get initial zoom position")
         initial_zoom = None
         
-        if resp_ascii and 'ZOM' in resp_ascii:
+        idx = _data_offset(resp_ascii, 'ZOM')
+        if idx is not None:
             try:
-                idx = resp_ascii.find('ZOM') + 3
                 if idx + 4 <= len(resp_ascii):
                     zoom_hex = resp_ascii[idx:idx+4]
-                    initial_zoom = int(zoom_hex, 16)
-                    if initial_zoom > 0x7FFF: initial_zoom -= 0x10000
+                    initial_zoom, = _INT16.unpack(bytes.fromhex(zoom_hex))
                     self.log(f"Initial zoom position: {initial_zoom} (hex: {zoom_hex})")
             except:
                 pass
@@ -254,13 +344,12 @@ class DetailedCommandTester:
         # Get new zoom position
         response, resp_ascii = self.send_raw_command(cmd, "Get zoom position after zoom in")
         
-        if resp_ascii and 'ZOM' in resp_ascii and initial_zoom is not None:
+        idx = _data_offset(resp_ascii, 'ZOM')
+        if idx is not None and initial_zoom is not None:
             try:
-                idx = resp_ascii.find('ZOM') + 3
                 if idx + 4 <= len(resp_ascii):
                     zoom_hex = resp_ascii[idx:idx+4]
-                    new_zoom = int(zoom_hex, 16)
-                    if new_zoom > 0x7FFF: new_zoom -= 0x10000
+                    new_zoom, = _INT16.unpack(bytes.fromhex(zoom_hex))
                     
                     zoom_change = new_zoom - initial_zoom
                     self.log(f"New zoom position: {new_zoom} (hex: {zoom_hex})")
@@ -275,9 +364,7 @@ class DetailedCommandTester:
     
     def test_recording_status(self):
         """Test recording commands with status verification"""
-        self.log("\n" + "="*80)
-        self.log("RECORDING TEST WITH VERIFICATION")
-        self.log("="*80)
+        self.log_banner("RECORDING TEST WITH VERIFICATION")
         
         # Get recording status
         cmd = b"#TPUD2rREC003E"
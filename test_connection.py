@@ -6,8 +6,9 @@ Quick test script to verify basic gimbal connectivity.
 """
 
 import socket
+import struct
 import time
-from gimbalcmdparse import build_command
+from gimbalcmdparse import build_command_cached
 from config import GIMBAL_CONFIG
 
 def test_basic_connection():
@@ -24,7 +25,7 @@ def test_basic_connection():
         recv_sock.settimeout(2.0)
         
         # Build a simple read attitude command
-        cmd = build_command(
+        cmd = build_command_cached(
             frame_header='#TP',
             address_bit1='P',    # Network source
             address_bit2='G',    # Gimbal destination
@@ -35,11 +36,12 @@ def test_basic_connection():
             output_format='ASCII'
         )
         
+        cmd_bytes = cmd.encode()
         print(f"Sending: {cmd}")
-        print(f"Hex: {cmd.encode().hex()}")
+        print(f"Hex: {cmd_bytes.hex()}")
         
         # Send command
-        send_sock.sendto(cmd.encode(), 
+        send_sock.sendto(cmd_bytes, 
                         (GIMBAL_CONFIG['camera_ip'], 
                          GIMBAL_CONFIG['control_port']))
         
@@ -49,29 +51,18 @@ def test_basic_connection():
             data, addr = recv_sock.recvfrom(1024)
             print(f"\n✅ SUCCESS! Received response from {addr}")
             print(f"Raw data: {data}")
-            print(f"Decoded: {data.decode('ascii', errors='ignore')}")
+            resp_str = data.decode('ascii', errors='ignore')
+            print(f"Decoded: {resp_str}")
             
             # Try to parse attitude if valid response
             if b'GAC' in data and len(data) > 20:
                 try:
-                    resp_str = data.decode('ascii', errors='ignore')
                     # Find data portion (after identifier, before CRC)
                     idx = resp_str.find('GAC') + 3
                     attitude_data = resp_str[idx:idx+12]
                     
-                    yaw_hex = attitude_data[0:4]
-                    pitch_hex = attitude_data[4:8]
-                    roll_hex = attitude_data[8:12]
-                    
-                    # Convert to degrees
-                    yaw = int(yaw_hex, 16)
-                    pitch = int(pitch_hex, 16)
-                    roll = int(roll_hex, 16)
-                    
-                    # Handle signed values
-                    if yaw > 0x7FFF: yaw -= 0x10000
-                    if pitch > 0x7FFF: pitch -= 0x10000
-                    if roll > 0x7FFF: roll -= 0x10000
+                    # Signed 16-bit big-endian values in 0.01° units
+                    yaw, pitch, roll = struct.unpack('>hhh', bytes.fromhex(attitude_data))
                     
                     print(f"\nGimbal Attitude:")
                     print(f"  Yaw:   {yaw/100:.2f}°")
@@ -7,9 +7,12 @@ Simple test to verify LOC command format and sending.
 
 import socket
 import struct
-from gimbalcmdparse import build_command
+from gimbalcmdparse import build_command, build_command_cached
 from config import GIMBAL_CONFIG
 
+# LOC payload: x, y, width, height, blur click as big-endian int16
+_LOC_STRUCT = struct.Struct('>5h')
+
 
 def test_loc_command():
     """Test LOC command building and sending"""
@@ -34,7 +37,7 @@ def test_loc_command():
     
     # Pack values as big-endian signed 16-bit integers
     vals = (param_x, param_y, param_w, param_h, blur_click)
-    data_bytes = b''.join(struct.pack('>h', v) for v in vals)
+    data_bytes = _LOC_STRUCT.pack(*vals)
     print(f"Data bytes (hex): {data_bytes.hex()}")
     
     # Convert to space-separated hex string for build_command
@@ -91,11 +94,11 @@ def test_stop_tracking():
     
     # Zero values to stop tracking
     vals = (0, 0, 0, 0, 0)
-    data_bytes = b''.join(struct.pack('>h', v) for v in vals)
+    data_bytes = _LOC_STRUCT.pack(*vals)
     data_hex = ' '.join(f'{b:02X}' for b in data_bytes)
     
     try:
-        cmd_hex = build_command(
+        cmd_hex = build_command_cached(
             frame_header='#tp',
             address_bit1='P',
             address_bit2='D',
@@ -3,31 +3,42 @@
 Test SEI and RTSP Connection
 =============================
 Diagnostic script to test RTSP streaming and ffmpeg availability.
+
+The ffmpeg and RTSP probes run concurrently with asyncio, so the total run
+time is bounded by the slower of the two rather than the sum of all probe
+timeouts. The OpenCV stream probe only runs once the RTSP port is open.
 """
 
+import asyncio
+import socket
 import subprocess
 import cv2
-import socket
 from config import GIMBAL_CONFIG, get_rtsp_url
 
+# Frames to skip over (without decoding) before retrieving one
+MAX_GRABS = 5
 
-def test_ffmpeg():
-    """Test if ffmpeg is installed and accessible"""
-    print("\n=== TESTING FFMPEG ===")
+# OpenCV open/read timeouts for the stream probe. It runs in a worker thread
+# that cannot be cancelled, so these bound how long it can block.
+STREAM_TIMEOUT_MS = 5000
+
+
+def _print_section(title):
+    """Print a test section header"""
+    print(f"\n=== {title} ===")
     print("-" * 30)
-    
+
+
+async def test_ffmpeg_async():
+    """Test if ffmpeg is installed and accessible"""
     try:
-        result = subprocess.run(['ffmpeg', '-version'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            print("[OK] ffmpeg is installed")
-            version_line = result.stdout.split('\n')[0]
-            print(f"Version: {version_line}")
-            return True
-        else:
-            print("[X] ffmpeg returned error")
-            return False
+        proc = await asyncio.create_subprocess_exec(
+            'ffmpeg', '-version',
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        stdout, _ = await proc.communicate()
     except FileNotFoundError:
+        _print_section("TESTING FFMPEG")
         print("[X] ffmpeg not found in PATH")
         print("\nTo install ffmpeg:")
         print("1. Download from: https://ffmpeg.org/download.html")
@@ -35,160 +46,230 @@ def test_ffmpeg():
         print("3. Or use: winget install ffmpeg (on Windows)")
         return False
     except Exception as e:
+        _print_section("TESTING FFMPEG")
         print(f"[X] Error testing ffmpeg: {e}")
         return False
 
+    _print_section("TESTING FFMPEG")
+    if proc.returncode == 0:
+        print("[OK] ffmpeg is installed")
+        version_line = stdout.decode(errors='replace').split('\n')[0]
+        print(f"Version: {version_line}")
+        return True
+    else:
+        print("[X] ffmpeg returned error")
+        return False
+
 
-def test_rtsp_connection():
+async def test_rtsp_connection_async():
     """Test RTSP port connectivity"""
-    print("\n=== TESTING RTSP CONNECTION ===")
-    print("-" * 30)
-    
-    # Test TCP connection to RTSP port
+    camera_ip = GIMBAL_CONFIG['camera_ip']
+
+    # Test TCP connection to RTSP port with a non-blocking connect; the
+    # event loop's selector waits for writability, so an open port returns
+    # as soon as the handshake completes and a dead host costs at most 2s
+    loop = asyncio.get_running_loop()
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(2.0)
-    
+    sock.setblocking(False)
+
     try:
-        result = sock.connect_ex((GIMBAL_CONFIG['camera_ip'], 554))
-        if result == 0:
-            print(f"[OK] RTSP port 554 is open on {GIMBAL_CONFIG['camera_ip']}")
-            return True
-        else:
-            print(f"[X] Cannot connect to RTSP port 554 on {GIMBAL_CONFIG['camera_ip']}")
-            return False
+        await asyncio.wait_for(loop.sock_connect(sock, (camera_ip, 554)), 2.0)
+        result = True
+        error = None
+    except (asyncio.TimeoutError, OSError):
+        # Same outcome as a non-zero connect_ex(): port closed or unreachable
+        result = False
+        error = None
     except Exception as e:
-        print(f"[X] Connection error: {e}")
-        return False
+        result = False
+        error = e
     finally:
         sock.close()
 
+    _print_section("TESTING RTSP CONNECTION")
+    if error is not None:
+        print(f"[X] Connection error: {error}")
+    elif result:
+        print(f"[OK] RTSP port 554 is open on {camera_ip}")
+    else:
+        print(f"[X] Cannot connect to RTSP port 554 on {camera_ip}")
+    return result
+
+
+def _read_rtsp_frame(rtsp_url):
+    """Open the stream and read one frame (blocking, run in a worker thread)"""
+    if hasattr(cv2, 'CAP_PROP_OPEN_TIMEOUT_MSEC'):
+        # OpenCV >= 4.5.2: bound the open and every read
+        cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG, [
+            cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, STREAM_TIMEOUT_MS,
+            cv2.CAP_PROP_READ_TIMEOUT_MSEC, STREAM_TIMEOUT_MS,
+        ])
+    else:
+        cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG)
+    try:
+        if not cap.isOpened():
+            return False, None, None
+
+        # Keep the backend queue short and skip ahead with grab(), which
+        # does not decode, so only the freshest frame is retrieved
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        grabbed = False
+        for _ in range(MAX_GRABS):
+            if not cap.grab():
+                break
+            grabbed = True
+
+        ret, frame = cap.retrieve() if grabbed else (False, None)
+        if not ret or frame is None:
+            return True, None, None
 
-def test_rtsp_stream():
+        return True, frame.shape[:2], cap.get(cv2.CAP_PROP_FPS)
+    finally:
+        cap.release()
+
+
+async def test_rtsp_stream_async():
     """Test RTSP stream with OpenCV"""
-    print("\n=== TESTING RTSP STREAM ===")
-    print("-" * 30)
-    
     rtsp_url = get_rtsp_url("main")
-    print(f"Testing: {rtsp_url}")
-    
+
     try:
-        cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG)
-        
-        if not cap.isOpened():
-            print("[X] Cannot open RTSP stream")
-            print("\nPossible issues:")
-            print("1. Wrong IP address or camera offline")
-            print("2. RTSP service not running on camera")
-            print("3. Network/firewall blocking connection")
-            return False
-        
-        # Try to read a frame
-        ret, frame = cap.read()
-        if ret and frame is not None:
-            height, width = frame.shape[:2]
-            print(f"[OK] Stream is working! Resolution: {width}x{height}")
-            
-            # Get stream properties
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            print(f"FPS: {fps}")
-            
-            cap.release()
-            return True
-        else:
-            print("[X] Cannot read frames from stream")
-            cap.release()
-            return False
-            
+        opened, shape, fps = await asyncio.to_thread(_read_rtsp_frame, rtsp_url)
     except Exception as e:
+        _print_section("TESTING RTSP STREAM")
+        print(f"Testing: {rtsp_url}")
         print(f"[X] Error testing stream: {e}")
         return False
 
+    _print_section("TESTING RTSP STREAM")
+    print(f"Testing: {rtsp_url}")
+
+    if not opened:
+        print("[X] Cannot open RTSP stream")
+        print("\nPossible issues:")
+        print("1. Wrong IP address or camera offline")
+        print("2. RTSP service not running on camera")
+        print("3. Network/firewall blocking connection")
+        return False
+
+    if shape is None:
+        print("[X] Cannot read frames from stream")
+        return False
+
+    height, width = shape
+    print(f"[OK] Stream is working! Resolution: {width}x{height}")
+
+    # Stream properties
+    print(f"FPS: {fps}")
+    return True
+
+
+async def _probe_codec(codec, rtsp_url):
+    """Run one ffmpeg probe and return its stderr (or an error message)"""
+    if codec == 'h264':
+        cmd = [
+            'ffmpeg', '-rtsp_transport', 'udp', '-i', rtsp_url,
+            '-frames:v', '10',  # Only process 10 frames
+            '-f', 'null', '-'
+        ]
+    else:
+        cmd = [
+            'ffmpeg', '-rtsp_transport', 'udp', '-i', rtsp_url,
+            '-c:v', 'hevc',
+            '-frames:v', '10',
+            '-f', 'null', '-'
+        ]
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+    except Exception as e:
+        return None, f"[X] Error: {e}"
+
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), 10)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None, f"[X] Timeout testing {codec}"
+
+    return stderr.decode(errors='replace'), None
 
-def test_stream_with_ffmpeg():
+
+async def test_stream_with_ffmpeg_async():
     """Test RTSP stream directly with ffmpeg"""
-    print("\n=== TESTING STREAM WITH FFMPEG ===")
-    print("-" * 30)
-    
     rtsp_url = get_rtsp_url("main")
-    
-    # Try both h264 and h265
-    for codec in ['h264', 'h265']:
+    codecs = ['h264', 'h265']
+
+    # Probe both codecs in parallel, then report in a fixed order
+    results = await asyncio.gather(*(_probe_codec(c, rtsp_url) for c in codecs))
+
+    _print_section("TESTING STREAM WITH FFMPEG")
+
+    for codec, (stderr, error) in zip(codecs, results):
         print(f"\nTesting {codec} codec...")
-        
-        if codec == 'h264':
-            cmd = [
-                'ffmpeg', '-rtsp_transport', 'udp', '-i', rtsp_url,
-                '-frames:v', '10',  # Only process 10 frames
-                '-f', 'null', '-'
-            ]
+
+        if error:
+            print(error)
+            continue
+
+        # Check stderr for codec information
+        if 'Video:' in stderr:
+            for line in stderr.split('\n'):
+                if 'Video:' in line:
+                    print(f"[OK] Found video stream: {line.strip()}")
+                    # Try to detect actual codec
+                    if 'h264' in line.lower():
+                        print("  -> Detected H.264 codec")
+                        return 'h264'
+                    elif 'hevc' in line.lower() or 'h265' in line.lower():
+                        print("  -> Detected H.265/HEVC codec")
+                        return 'h265'
         else:
-            cmd = [
-                'ffmpeg', '-rtsp_transport', 'udp', '-i', rtsp_url,
-                '-c:v', 'hevc',
-                '-frames:v', '10',
-                '-f', 'null', '-'
-            ]
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            # Check stderr for codec information
-            if 'Video:' in result.stderr:
-                for line in result.stderr.split('\n'):
-                    if 'Video:' in line:
-                        print(f"[OK] Found video stream: {line.strip()}")
-                        # Try to detect actual codec
-                        if 'h264' in line.lower():
-                            print("  -> Detected H.264 codec")
-                            return 'h264'
-                        elif 'hevc' in line.lower() or 'h265' in line.lower():
-                            print("  -> Detected H.265/HEVC codec")
-                            return 'h265'
-            else:
-                print(f"[X] No video stream found for {codec}")
-                
-        except subprocess.TimeoutExpired:
-            print(f"[X] Timeout testing {codec}")
-        except Exception as e:
-            print(f"[X] Error: {e}")
-    
+            print(f"[X] No video stream found for {codec}")
+
     return None
 
 
-def main():
+async def _probe_rtsp():
+    """Probe the RTSP port, then the stream only if the port is open"""
+    rtsp_ok = await test_rtsp_connection_async()
+    stream_ok = await test_rtsp_stream_async() if rtsp_ok else False
+    return rtsp_ok, stream_ok
+
+
+async def main():
     """Run all tests"""
     print("="*50)
     print("GIMBAL SEI/RTSP DIAGNOSTIC TEST")
     print("="*50)
-    
-    # Test ffmpeg
-    ffmpeg_ok = test_ffmpeg()
-    
-    # Test RTSP connection
-    rtsp_ok = test_rtsp_connection()
-    
-    # Test RTSP stream
-    if rtsp_ok:
-        stream_ok = test_rtsp_stream()
-        
-        # Test with ffmpeg if available
-        if ffmpeg_ok and stream_ok:
-            detected_codec = test_stream_with_ffmpeg()
-            if detected_codec:
-                print(f"\n[RECOMMENDATION] Use codec='{detected_codec}' for SEI parsing")
-    
+
+    # The ffmpeg probe overlaps the RTSP probes. The stream probe waits for
+    # the port check, so a dead host costs the 2s connect timeout rather
+    # than OpenCV's open timeout.
+    ffmpeg_ok, (rtsp_ok, stream_ok) = await asyncio.gather(
+        test_ffmpeg_async(),
+        _probe_rtsp()
+    )
+
+    # Test with ffmpeg if available
+    if rtsp_ok and ffmpeg_ok and stream_ok:
+        detected_codec = await test_stream_with_ffmpeg_async()
+        if detected_codec:
+            print(f"\n[RECOMMENDATION] Use codec='{detected_codec}' for SEI parsing")
+
     print("\n" + "="*50)
     print("SUMMARY")
     print("="*50)
     print(f"ffmpeg available: {'Yes' if ffmpeg_ok else 'No'}")
     print(f"RTSP port open: {'Yes' if rtsp_ok else 'No'}")
-    
+
     if not ffmpeg_ok:
         print("\n[ACTION REQUIRED] Install ffmpeg to enable SEI telemetry parsing")
-    
+
     if not rtsp_ok:
         print("\n[ACTION REQUIRED] Check camera connection and RTSP service")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
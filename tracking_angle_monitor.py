@@ -7,148 +7,329 @@ When tracking is active, these angles represent the target position
 since the gimbal keeps the target centered in view.
 """
 
+import argparse
+import binascii
+import select
 import socket
+import sys
 import time
 import struct
 import threading
 from datetime import datetime
-from gimbalcmdparse import build_command
+from types import MappingProxyType
+from gimbalcmdparse import build_command, build_command_bytes
 from config import GIMBAL_CONFIG
 import os
 
 
+# Socket settings
+RECV_TIMEOUT = 0.1          # seconds, request/reply reads
+# Kernel buffer for bursts of auto-sent attitude frames. Linux caps this at
+# net.core.rmem_max / wmem_max; raise those to use the full size, e.g.
+#   sysctl -w net.core.rmem_max=12582912 net.core.wmem_max=12582912
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Monitor loop tuning
+TRC_POLL_RATE = 2          # Hz, tracking status queries
+MAX_DRAIN_PER_TICK = 32    # datagrams handled per tick before redrawing
+STALE_AFTER = 1.0          # seconds before a status/angle sample is dropped
+
+# LOC payload: x, y, width, height, blur click (5 x big-endian int16)
+_LOC_STRUCT = struct.Struct('>hhhhh')
+
+# GAC payload once hex-decoded: yaw, pitch, roll (3 x big-endian int16)
+_ANGLE_STRUCT = struct.Struct('>hhh')
+
+# Static parts of the monitor screen (row 8 onwards)
+_DISPLAY_HOME = "\033[8;0H\n"
+_STATUS_HEADER = "\033[1;34m📊 TRACKING STATUS\033[0m\n" + "-" * 40 + "\n"
+_ANGLES_HEADER = "\n\033[1;34m🎯 GIMBAL ANGLES (Target Position)\033[0m\n" + "-" * 40 + "\n"
+_STATE_LINES = {
+    2: "State:  \033[1;32m● TRACKING ACTIVE\033[0m\n",
+    1: "State:  \033[1;33m◐ WAITING FOR TARGET\033[0m\n",
+    3: "State:  \033[1;31m◯ TEMPORARILY LOST\033[0m\n",
+}
+_STATE_INACTIVE = "State:  \033[1;90m○ INACTIVE\033[0m\n"
+
+# Angle indicator bars, one per marker position. Position BAR_WIDTH
+# (angle at the upper limit) falls past the end and shows no marker.
+BAR_WIDTH = 30
+
+
+def _build_angle_bar(pos):
+    bar = ["-"] * BAR_WIDTH
+    bar[BAR_WIDTH // 2] = "|"
+    if pos < BAR_WIDTH:
+        bar[pos] = "●"
+    return "[" + "".join(bar) + "]"
+
+
+_ANGLE_BARS = tuple(_build_angle_bar(pos) for pos in range(BAR_WIDTH + 1))
+
+# Frame identifiers handled by the monitor loop, in dispatch priority
+_MONITORED_IDS = (b'GAC', b'TRC')
+
+# TRC R1 (tracking mode) and R2 (tracking status) descriptions
+_MODE_DESC = MappingProxyType({
+    0: "Reserved"
+})
+_STATUS_DESC = MappingProxyType({
+    0: "Tracking not enabled",
+    1: "Target to be selected",
+    2: "Tracker in tracking state",
+    3: "Tracking temporarily lost"
+})
+
+# 16-point compass rose, 22.5 degrees per sector
+_COMPASS = ("N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+            "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW")
+
+
+def parse_gac(buf, off):
+    """
+    Decode the GAC attitude payload starting at buf[off]
+
+    The payload is three 4-digit ASCII-hex signed 16-bit values in 0.01°
+    units. Works directly on the received bytes, so callers do not need to
+    decode the datagram to str first.
+
+    Returns:
+        (yaw, pitch, roll) in degrees
+
+    Raises:
+        ValueError: If the payload contains non-hex characters (raised as
+            binascii.Error, a ValueError subclass)
+    """
+    # Hex digits -> 6 raw bytes -> three signed big-endian int16s
+    yaw, pitch, roll = _ANGLE_STRUCT.unpack(binascii.unhexlify(buf[off:off+12]))
+    
+    return yaw / 100.0, pitch / 100.0, roll / 100.0
+
+
+def frame_identifier(buf):
+    """
+    Classify a received frame in a single pass
+
+    SIP frames carry the 3-letter identifier at bytes 7-9 (after the
+    header, addresses, length and control fields), so that slot is checked
+    first; frames with a non-standard prefix fall back to a search.
+
+    Returns:
+        (identifier, index of the identifier in buf), or (None, -1) if the
+        frame is neither GAC nor TRC
+    """
+    ident = buf[7:10]
+    if ident in _MONITORED_IDS:
+        return ident, 7
+    for ident in _MONITORED_IDS:
+        idx = buf.find(ident)
+        if idx != -1:
+            return ident, idx
+    return None, -1
+
+
 class TrackingAngleMonitor:
-    def __init__(self):
+    def __init__(self, pin_cpu=None, share_port=False):
+        """
+        Args:
+            pin_cpu: Optional CPU to run the monitor loop on (Linux only).
+                Pick the core that services the NIC's receive queue IRQ,
+                as listed in /proc/interrupts, to keep packet handling and
+                parsing on the same core.
+            share_port: Set SO_REUSEPORT so other sockets can bind the
+                listen port too. The kernel then splits incoming datagrams
+                between them, so each sees only part of the replies; by
+                default a second instance fails with EADDRINUSE instead.
+        """
         self.camera_ip = GIMBAL_CONFIG['camera_ip']
         self.control_port = GIMBAL_CONFIG['control_port']
         self.listen_port = GIMBAL_CONFIG['listen_port']
+        self.pin_cpu = pin_cpu
         
         # Communication sockets
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        # Fix the destination once; replies arrive on recv_sock, so the
+        # connected socket's source filtering never drops anything
+        self.sock.connect((self.camera_ip, self.control_port))
         self.recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        # Opt-in only; must be set before bind; not available on Windows
+        if share_port:
+            if not hasattr(socket, 'SO_REUSEPORT'):
+                raise OSError("SO_REUSEPORT is not supported on this platform")
+            self.recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         self.recv_sock.bind(('0.0.0.0', self.listen_port))
-        self.recv_sock.settimeout(0.1)
+        self.recv_sock.settimeout(RECV_TIMEOUT)
+        
+        # Reusable receive buffer for the monitor loop; each datagram is
+        # copied out at its exact size instead of allocating 2 KB per recv
+        self._recvbuf = bytearray(2048)
+        self._recvmv = memoryview(self._recvbuf)
+        
+        # Constant commands, built once and sent as-is
+        self._trc_read_cmd = build_command(
+            frame_header='#TP',
+            address_bit1='P',
+            address_bit2='D',
+            control_bit='r',
+            identifier_bit='TRC',
+            data='00',
+            data_mode='ASCII',
+            output_format='ASCII'
+        ).encode('ascii')
+        self._gac_read_cmd = build_command(
+            frame_header='#TP',
+            address_bit1='P',
+            address_bit2='G',
+            control_bit='r',
+            identifier_bit='GAC',
+            data='00',
+            data_mode='ASCII',
+            output_format='ASCII'
+        ).encode('ascii')
+        self._gaa_enable_cmd = build_command(
+            frame_header='#TP',
+            address_bit1='P',
+            address_bit2='G',
+            control_bit='w',
+            identifier_bit='GAA',
+            data='01',  # Enable
+            data_mode='ASCII',
+            output_format='ASCII'
+        ).encode('ascii')
         
         # State tracking
         self.monitoring = False
-        self.tracking_status = {'mode': 0, 'status': 0}
+        self.tracking_status = None
         self.last_angles = None
         self.last_gps = None
         
     def get_tracking_status(self):
         """Get tracking status using TRC command (protocol section 2)"""
         try:
-            # Build TRC read command
-            cmd = build_command(
-                frame_header='#TP',
-                address_bit1='P',
-                address_bit2='D',
-                control_bit='r',
-                identifier_bit='TRC',
-                data='00',
-                data_mode='ASCII',
-                output_format='ASCII'
-            )
-            
-            self.sock.sendto(cmd.encode('ascii'), (self.camera_ip, self.control_port))
+            self.sock.send(self._trc_read_cmd)
             
             # Wait for response
             data, _ = self.recv_sock.recvfrom(1024)
-            resp = data.decode('ascii', errors='replace')
-            
-            if 'TRC' in resp:
-                # Parse R1R2 from response
-                idx = resp.find('TRC') + 3
-                if idx + 2 <= len(resp):
-                    r1 = resp[idx]     # Tracking mode
-                    r2 = resp[idx+1]   # Tracking status
-                    
-                    mode = int(r1) if r1.isdigit() else 0
-                    status = int(r2) if r2.isdigit() else 0
+            return self._parse_tracking_status(data)
                     
-                    self.tracking_status = {
-                        'mode': mode,
-                        'status': status,
-                        'mode_desc': self._get_mode_desc(mode),
-                        'status_desc': self._get_status_desc(status)
-                    }
-                    
-                    return self.tracking_status
-                    
-        except Exception as e:
-            pass
+        except OSError:
+            pass  # Timeout (socket.timeout) or socket error
+        
+        return None
+    
+    def _parse_tracking_status(self, data, idx=None):
+        """Parse a raw TRC response and store it in self.tracking_status"""
+        if idx is None:
+            idx = data.find(b'TRC')
+        if idx != -1:
+            # Parse R1R2 from response (ASCII digits, compared as byte values)
+            idx += 3
+            if idx + 2 <= len(data):
+                r1 = data[idx]     # Tracking mode
+                r2 = data[idx+1]   # Tracking status
+                
+                mode = r1 - 0x30 if 0x30 <= r1 <= 0x39 else 0
+                status = r2 - 0x30 if 0x30 <= r2 <= 0x39 else 0
+                
+                self.tracking_status = {
+                    'mode': mode,
+                    'status': status,
+                    'mode_desc': self._get_mode_desc(mode),
+                    'status_desc': self._get_status_desc(status),
+                    'timestamp': time.time()
+                }
+                
+                return self.tracking_status
         
         return None
     
+    def request_tracking_status(self):
+        """Send a TRC read without waiting; the reply is handled by the drain"""
+        self.sock.send(self._trc_read_cmd)
+    
+    def _drain_frames(self):
+        """Receive every datagram already queued on recv_sock (non-blocking mode)"""
+        frames = []
+        while len(frames) < MAX_DRAIN_PER_TICK:
+            try:
+                nbytes = self.recv_sock.recv_into(self._recvbuf)
+                frames.append(bytes(self._recvmv[:nbytes]))
+            except BlockingIOError:
+                break  # Queue is empty
+            except OSError:
+                break
+        return frames
+    
+    def _wait_frame(self, timeout):
+        """Wait up to timeout seconds for one datagram on recv_sock (non-blocking mode)"""
+        try:
+            readable, _, _ = select.select([self.recv_sock], [], [], timeout)
+            if readable:
+                nbytes = self.recv_sock.recv_into(self._recvbuf)
+                return bytes(self._recvmv[:nbytes])
+        except OSError:
+            pass  # Socket error; treat like a timeout
+        return None
+    
+    def _dispatch_frame(self, data):
+        """Route a received frame to its parser by identifier"""
+        ident, idx = frame_identifier(data)
+        if ident == b'GAC':
+            self._parse_angles(data, idx)
+        elif ident == b'TRC':
+            self._parse_tracking_status(data, idx)
+    
+    def _fresh(self, sample):
+        """Return sample if it was received recently enough to display"""
+        if sample and time.time() - sample['timestamp'] <= STALE_AFTER:
+            return sample
+        return None
+    
     def _get_mode_desc(self, mode):
         """Get mode description"""
-        modes = {
-            0: "Reserved"
-        }
-        return modes.get(mode, f"Unknown ({mode})")
+        return _MODE_DESC.get(mode, f"Unknown ({mode})")
     
     def _get_status_desc(self, status):
         """Get status description from protocol"""
-        statuses = {
-            0: "Tracking not enabled",
-            1: "Target to be selected",
-            2: "Tracker in tracking state",
-            3: "Tracking temporarily lost"
-        }
-        return statuses.get(status, f"Unknown ({status})")
+        return _STATUS_DESC.get(status, f"Unknown ({status})")
     
     def get_gimbal_angles(self):
         """Get magnetic angles (relative to mount) - Protocol 4.3.3"""
         try:
-            # Build GAC command
-            cmd = build_command(
-                frame_header='#TP',
-                address_bit1='P',
-                address_bit2='G',
-                control_bit='r',
-                identifier_bit='GAC',
-                data='00',
-                data_mode='ASCII',
-                output_format='ASCII'
-            )
-            
-            self.sock.sendto(cmd.encode('ascii'), (self.camera_ip, self.control_port))
+            self.sock.send(self._gac_read_cmd)
             
             # Parse response
             data, _ = self.recv_sock.recvfrom(1024)
-            resp = data.decode('ascii', errors='replace')
-            
-            if 'GAC' in resp:
-                idx = resp.find('GAC') + 3
-                if idx + 12 <= len(resp):
-                    # Extract angle values (4 chars each)
-                    yaw_hex = resp[idx:idx+4]
-                    pitch_hex = resp[idx+4:idx+8]
-                    roll_hex = resp[idx+8:idx+12]
-                    
-                    # Convert from hex string to signed integers
-                    yaw = int(yaw_hex, 16)
-                    pitch = int(pitch_hex, 16)
-                    roll = int(roll_hex, 16)
-                    
-                    # Handle signed values (16-bit)
-                    if yaw > 0x7FFF: yaw -= 0x10000
-                    if pitch > 0x7FFF: pitch -= 0x10000
-                    if roll > 0x7FFF: roll -= 0x10000
+            return self._parse_angles(data)
                     
-                    # Convert to degrees (0.01 degree units)
-                    angles = {
-                        'yaw': yaw / 100.0,
-                        'pitch': pitch / 100.0,
-                        'roll': roll / 100.0,
-                        'timestamp': time.time()
-                    }
-                    
-                    self.last_angles = angles
-                    return angles
-                    
-        except Exception as e:
-            pass
+        except OSError:
+            pass  # Timeout (socket.timeout) or socket error
+        
+        return None
+    
+    def _parse_angles(self, data, idx=None):
+        """Parse a raw GAC frame (polled or auto-sent) into self.last_angles"""
+        if idx is None:
+            idx = data.find(b'GAC')
+        if idx != -1:
+            idx += 3
+            if idx + 12 <= len(data):
+                try:
+                    yaw, pitch, roll = parse_gac(data, idx)
+                except ValueError:
+                    return None  # Corrupt hex digits
+                
+                angles = {
+                    'yaw': yaw,
+                    'pitch': pitch,
+                    'roll': roll,
+                    'timestamp': time.time()
+                }
+                
+                self.last_angles = angles
+                return angles
         
         return None
     
@@ -162,18 +343,7 @@ class TrackingAngleMonitor:
     def enable_attitude_auto_send(self):
         """Enable automatic attitude sending - Protocol 4.3.4"""
         try:
-            cmd = build_command(
-                frame_header='#TP',
-                address_bit1='P',
-                address_bit2='G',
-                control_bit='w',
-                identifier_bit='GAA',
-                data='01',  # Enable
-                data_mode='ASCII',
-                output_format='ASCII'
-            )
-            
-            self.sock.sendto(cmd.encode('ascii'), (self.camera_ip, self.control_port))
+            self.sock.send(self._gaa_enable_cmd)
             print("✓ Enabled automatic attitude reporting")
             return True
             
@@ -186,10 +356,17 @@ class TrackingAngleMonitor:
         print("\033[2J\033[H")  # Clear screen
         print("\033[?25l")      # Hide cursor
         
+        if self.pin_cpu is not None and hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, {self.pin_cpu})
+        
         self.monitoring = True
         update_interval = 1.0 / update_rate
         last_update = 0
         
+        # Angles arrive as auto-sent GAC frames; TRC is polled at ~2 Hz
+        trc_every = max(1, round(update_rate / TRC_POLL_RATE))
+        tick = 0
+        
         # Enable automatic attitude sending
         self.enable_attitude_auto_send()
         
@@ -199,120 +376,105 @@ class TrackingAngleMonitor:
         print("When tracking is active, gimbal angles = target position relative to mount")
         print("Press Ctrl+C to stop\n")
         
+        # recv_sock stays non-blocking for the whole loop so neither the
+        # wait nor the drain has to switch socket modes on every tick
+        self.recv_sock.setblocking(False)
+        
         try:
             while self.monitoring:
-                current_time = time.time()
+                # Block on the listen socket until the next tick is due, so
+                # pushed frames are handled on arrival and the timeout
+                # itself marks the tick (no polling sleep)
+                remaining = update_interval - (time.monotonic() - last_update)
+                if remaining > 0:
+                    frame = self._wait_frame(remaining)
+                    if frame is not None:
+                        self._dispatch_frame(frame)
+                    continue
                 
-                if current_time - last_update >= update_interval:
-                    last_update = current_time
-                    
-                    # Get tracking status
-                    tracking_status = self.get_tracking_status()
-                    
-                    # Get gimbal angles
-                    angles = self.get_gimbal_angles()
-                    
-                    # Update display
-                    self._update_display(tracking_status, angles)
+                last_update = time.monotonic()
+                
+                # Ask for tracking status every few ticks
+                if tick % trc_every == 0:
+                    self.request_tracking_status()
+                tick += 1
+                
+                # Consume pushed attitude frames and any TRC replies
+                for frame in self._drain_frames():
+                    self._dispatch_frame(frame)
                 
-                time.sleep(0.01)
+                # Update display
+                self._update_display(self._fresh(self.tracking_status),
+                                     self._fresh(self.last_angles))
                 
         except KeyboardInterrupt:
             print("\n\nMonitoring stopped")
         finally:
+            self.recv_sock.settimeout(RECV_TIMEOUT)
             print("\033[?25h")  # Show cursor
             self.monitoring = False
     
     def _update_display(self, tracking_status, angles):
         """Update the display with current data"""
-        # Move cursor to position
-        print("\033[8;0H")  # Row 8, column 0
-        
-        # Tracking Status Section
-        print("\033[1;34m📊 TRACKING STATUS\033[0m")
-        print("-" * 40)
+        # Compose the whole screen and emit it with a single write
+        out = [_DISPLAY_HOME, _STATUS_HEADER]
         
         if tracking_status:
             status_color = "\033[1;32m" if tracking_status['status'] == 2 else "\033[1;33m"
-            print(f"Status: {status_color}{tracking_status['status_desc']}\033[0m")
+            out.append(f"Status: {status_color}{tracking_status['status_desc']}\033[0m\n")
             
             # Visual indicator
-            if tracking_status['status'] == 2:
-                print("State:  \033[1;32m● TRACKING ACTIVE\033[0m")
-            elif tracking_status['status'] == 1:
-                print("State:  \033[1;33m◐ WAITING FOR TARGET\033[0m")
-            elif tracking_status['status'] == 3:
-                print("State:  \033[1;31m◯ TEMPORARILY LOST\033[0m")
-            else:
-                print("State:  \033[1;90m○ INACTIVE\033[0m")
+            out.append(_STATE_LINES.get(tracking_status['status'], _STATE_INACTIVE))
         else:
-            print("Status: \033[1;31mNo response\033[0m")
-        
-        print()
+            out.append("Status: \033[1;31mNo response\033[0m\n")
         
-        # Gimbal Angles Section
-        print("\033[1;34m🎯 GIMBAL ANGLES (Target Position)\033[0m")
-        print("-" * 40)
+        out.append(_ANGLES_HEADER)
         
         if angles:
             # Color code based on tracking status
             if tracking_status and tracking_status['status'] == 2:
-                print("\033[1;32m[TRACKING - Angles represent target position]\033[0m")
+                out.append("\033[1;32m[TRACKING - Angles represent target position]\033[0m\n")
             else:
-                print("\033[1;90m[NOT TRACKING - Angles show gimbal orientation]\033[0m")
+                out.append("\033[1;90m[NOT TRACKING - Angles show gimbal orientation]\033[0m\n")
             
-            print(f"\nYaw:   \033[1;37m{angles['yaw']:8.2f}°\033[0m  ", end="")
-            self._draw_angle_bar(angles['yaw'], -150, 150)
+            out.append(f"\nYaw:   \033[1;37m{angles['yaw']:8.2f}°\033[0m  ")
+            out.append(self._draw_angle_bar(angles['yaw'], -150, 150))
             
-            print(f"\nPitch: \033[1;37m{angles['pitch']:8.2f}°\033[0m  ", end="")
-            self._draw_angle_bar(angles['pitch'], -90, 90)
+            out.append(f"\nPitch: \033[1;37m{angles['pitch']:8.2f}°\033[0m  ")
+            out.append(self._draw_angle_bar(angles['pitch'], -90, 90))
             
-            print(f"\nRoll:  \033[1;37m{angles['roll']:8.2f}°\033[0m  ", end="")
-            self._draw_angle_bar(angles['roll'], -90, 90)
+            out.append(f"\nRoll:  \033[1;37m{angles['roll']:8.2f}°\033[0m  ")
+            out.append(self._draw_angle_bar(angles['roll'], -90, 90))
             
             # Calculate target bearing if tracking
             if tracking_status and tracking_status['status'] == 2:
                 bearing = (angles['yaw'] + 360) % 360
                 elevation = angles['pitch']
                 
-                print(f"\n\n\033[1;35mTarget Bearing:\033[0m {bearing:.1f}° (from North)")
-                print(f"\033[1;35mTarget Elevation:\033[0m {elevation:.1f}°")
+                out.append(f"\n\n\033[1;35mTarget Bearing:\033[0m {bearing:.1f}° (from North)\n")
+                out.append(f"\033[1;35mTarget Elevation:\033[0m {elevation:.1f}°\n")
                 
                 # Simple compass direction
                 compass = self._get_compass_direction(bearing)
-                print(f"\033[1;35mDirection:\033[0m {compass}")
+                out.append(f"\033[1;35mDirection:\033[0m {compass}\n")
         else:
-            print("\033[1;31mNo angle data available\033[0m")
+            out.append("\033[1;31mNo angle data available\033[0m\n")
         
         # Clear remaining lines
-        print("\033[J", end="")
+        out.append("\033[J")
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
     
     def _draw_angle_bar(self, angle, min_val, max_val):
-        """Draw a visual angle indicator bar"""
-        bar_width = 30
+        """Build a visual angle indicator bar"""
         normalized = (angle - min_val) / (max_val - min_val)
         normalized = max(0, min(1, normalized))  # Clamp to 0-1
         
-        pos = int(normalized * bar_width)
-        
-        bar = "["
-        for i in range(bar_width):
-            if i == pos:
-                bar += "●"
-            elif i == bar_width // 2:
-                bar += "|"
-            else:
-                bar += "-"
-        bar += "]"
-        
-        print(bar, end="")
+        return _ANGLE_BARS[int(normalized * BAR_WIDTH)]
     
     def _get_compass_direction(self, bearing):
-        """Convert bearing to compass direction"""
-        directions = ["N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
-                     "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"]
-        index = int((bearing + 11.25) / 22.5) % 16
-        return directions[index]
+        """Convert bearing (0-360) to compass direction"""
+        return _COMPASS[int(bearing * (16 / 360) + 0.5) & 15]
     
     def test_tracking_sequence(self):
         """Test sequence: Start tracking and monitor angles"""
@@ -340,29 +502,21 @@ class TrackingAngleMonitor:
                 output_format='ASCII'
             )
             
-            self.sock.sendto(cmd.encode('ascii'), (self.camera_ip, self.control_port))
+            self.sock.send(cmd.encode('ascii'))
             time.sleep(0.5)
             
             # Then send LOC command to track center
             vals = (0, 0, 100, 100, 8)  # Center position, 100x100 box, blur click enabled
-            data_bytes = b''.join(struct.pack('>h', v) for v in vals)
-            data_hex = ' '.join(f'{b:02X}' for b in data_bytes)
-            
-            cmd = build_command(
+            cmd_bytes = build_command_bytes(
                 frame_header='#tp',
                 address_bit1='P',
                 address_bit2='D',
                 control_bit='w',
                 identifier_bit='LOC',
-                data=data_hex,
-                data_mode='Hex',
-                input_space_separate=True,
-                output_format='Hex',
-                output_space_separate=False
+                data=_LOC_STRUCT.pack(*vals)
             )
             
-            cmd_bytes = bytes.fromhex(cmd)
-            self.sock.sendto(cmd_bytes, (self.camera_ip, self.control_port))
+            self.sock.send(cmd_bytes)
             
             print("✓ Sent tracking command for center position")
             return True
@@ -374,6 +528,16 @@ class TrackingAngleMonitor:
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Gimbal tracking angle monitor")
+    parser.add_argument('--pin-cpu', type=int, metavar='CPU',
+                        help="run the monitor loop on this CPU (Linux only)")
+    parser.add_argument('--share-port', action='store_true',
+                        help="let other sockets bind the listen port too "
+                             "(SO_REUSEPORT; replies are split between them)")
+    args = parser.parse_args()
+    if args.pin_cpu is not None and not hasattr(os, 'sched_setaffinity'):
+        parser.error("--pin-cpu is only supported on Linux")
+    
     print("\033[1;36m" + "="*70 + "\033[0m")
     print("\033[1;33mGIMBAL TRACKING ANGLE MONITOR\033[0m")
     print("\033[1;36m" + "="*70 + "\033[0m")
@@ -383,7 +547,7 @@ def main():
     print("the center of the image, the angle of the camera is the angle")
     print("of the tracking target.'")
     
-    monitor = TrackingAngleMonitor()
+    monitor = TrackingAngleMonitor(pin_cpu=args.pin_cpu, share_port=args.share_port)
     
     print("\n\033[1;34mOptions:\033[0m")
     print("1. Monitor angles only (use with app tracking)")
@@ -10,12 +10,39 @@ import socket
 import struct
 import time
 import logging
-from gimbalcmdparse import build_command
+import numpy as np
+from gimbalcmdparse import build_command_bytes
 from config import GIMBAL_CONFIG
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('TrackingDemo')
 
+# LOC payload: x, y, width, height, blur click (5 x big-endian int16)
+_LOC_STRUCT = struct.Struct('>hhhhh')
+LOC_DATA_LEN = _LOC_STRUCT.size
+
+
+def preview_to_params(boxes, preview_width: int = 1920, preview_height: int = 1080):
+    """
+    Convert preview-pixel boxes to LOC protocol values in one pass
+    
+    Args:
+        boxes: Sequence of (x, y, width, height) in preview pixels
+        preview_width: Preview resolution width (default 1920)
+        preview_height: Preview resolution height (default 1080)
+        
+    Returns:
+        List of (param_x, param_y, param_w, param_h) integer tuples
+    """
+    dims = np.array([preview_width, preview_height, preview_width, preview_height],
+                    dtype=np.float64)
+    offset = np.array([1000, 1000, 0, 0])
+    # Same operation order as start_tracking (2000 * x / dim - 1000): a
+    # precomputed 2000 / dim scale rounds differently for some pixels.
+    # np.round rounds half to even, like round().
+    params = np.round(np.asarray(boxes, dtype=np.float64) * 2000 / dims - offset)
+    return [tuple(p) for p in params.astype(np.int32).tolist()]
+
 
 class TrackingController:
     """Controller for gimbal tracking operations"""
@@ -24,6 +51,20 @@ class TrackingController:
         self.camera_ip = camera_ip
         self.control_port = control_port
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect((camera_ip, control_port))
+        
+        # The LOC frame only varies in its 10-byte payload and the CRC, so
+        # build it once and keep the fixed header and its byte sum
+        template = build_command_bytes(
+            frame_header='#tp',
+            address_bit1='P',      # Network source
+            address_bit2='D',      # System/Image destination
+            control_bit='w',       # Write command
+            identifier_bit='LOC',  # Location/tracking command
+            data=bytes(LOC_DATA_LEN)
+        )
+        self._loc_prefix = template[:-(LOC_DATA_LEN + 2)]
+        self._loc_prefix_sum = sum(self._loc_prefix)
         
     def start_tracking(self, x: int, y: int, width: int = 64, height: int = 64,
                       preview_width: int = 1920, preview_height: int = 1080):
@@ -44,35 +85,31 @@ class TrackingController:
         param_w = round(2000 * width / preview_width)
         param_h = round(2000 * height / preview_height)
         
-        # Blur click enabled (8) or disabled (0)
-        blur_click = 8  # Enable blur click for better tracking
-        
         logger.info(f"Starting tracking at ({x},{y}) with size {width}x{height}")
+        self.send_tracking_params(param_x, param_y, param_w, param_h)
+        
+    def send_tracking_params(self, param_x: int, param_y: int,
+                             param_w: int, param_h: int, blur_click: int = 8):
+        """
+        Send a LOC command from already converted protocol values
+        
+        Args:
+            param_x, param_y: Object center in protocol units (-1000..1000)
+            param_w, param_h: Object size in protocol units (0..2000)
+            blur_click: Blur click enabled (8) or disabled (0)
+        """
         logger.info(f"Protocol values: x={param_x}, y={param_y}, w={param_w}, h={param_h}")
         
         # Pack parameters as big-endian signed 16-bit integers
-        vals = (param_x, param_y, param_w, param_h, blur_click)
-        data_bytes = b''.join(struct.pack('>h', v) for v in vals)
-        data_hex = ' '.join(f'{b:02X}' for b in data_bytes)
+        payload = _LOC_STRUCT.pack(param_x, param_y, param_w, param_h, blur_click)
         
-        # Build LOC command
-        cmd = build_command(
-            frame_header='#tp',
-            address_bit1='P',      # Network source
-            address_bit2='D',      # System/Image destination
-            control_bit='w',       # Write command
-            identifier_bit='LOC',  # Location/tracking command
-            data=data_hex,
-            data_mode='Hex',
-            input_space_separate=True,
-            output_format='Hex',
-            output_space_separate=False
-        )
+        # Splice the payload into the cached LOC frame and append the CRC
+        crc = (self._loc_prefix_sum + sum(payload)) & 0xFF
+        cmd_bytes = self._loc_prefix + payload + b'%02X' % crc
         
         # Send command
-        cmd_bytes = bytes.fromhex(cmd)
-        self.sock.sendto(cmd_bytes, (self.camera_ip, self.control_port))
-        logger.info(f"Tracking command sent (hex): {cmd}")
+        self.sock.send(cmd_bytes)
+        logger.info(f"Tracking command sent (hex): {cmd_bytes.hex().upper()}")
         
     def stop_tracking(self):
         """Stop object tracking"""
@@ -111,18 +148,22 @@ def demo_tracking():
             (960, 540, "center")
         ]
         
+        # Convert the whole script up front
+        position_params = preview_to_params([(x, y, 80, 80) for x, y, _ in positions])
+        
         print("\n2. Tracking different positions...")
-        for x, y, desc in positions:
+        for (x, y, desc), params in zip(positions, position_params):
             print(f"   Tracking {desc} ({x},{y})...")
-            tracker.start_tracking(x, y, 80, 80)
+            tracker.send_tracking_params(*params)
             time.sleep(2)
         
         # Demo 3: Different object sizes
         print("\n3. Testing different tracking box sizes...")
         sizes = [(50, 50), (100, 100), (150, 150), (200, 200)]
-        for w, h in sizes:
+        size_params = preview_to_params([(960, 540, w, h) for w, h in sizes])
+        for (w, h), params in zip(sizes, size_params):
             print(f"   Tracking with size {w}x{h}...")
-            tracker.start_tracking(960, 540, w, h)
+            tracker.send_tracking_params(*params)
             time.sleep(2)
         
         # Stop tracking
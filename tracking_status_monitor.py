@@ -8,11 +8,150 @@ Based on protocol LOC command and GPS/ranging data.
 
 # WORKING!!!
 
+import binascii
+import copy
+import queue
+import selectors
 import socket
+import sys
+import threading
 import time
 import struct
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from config import GIMBAL_CONFIG
+from gimbalcmdparse import calculate_crc
+
+# Fixed read commands (CRC included)
+CMD_GAC = b"#TPPG2rGAC002D"   # Magnetic attitude (protocol 4.3.3)
+CMD_GIC = b"#TPUG2rGIC003A"   # Gyroscope attitude (protocol 4.3.5)
+
+# Reply identifiers filed by TrackingMonitor._drain_responses()
+RESPONSE_MARKERS = (b'GAC', b'GIC', b'LRF', b'LON', b'LAT', b'TMP')
+RESPONSE_TIMEOUT = 0.5   # seconds to wait for a polled reply
+CYCLE_BUDGET = 0.4       # seconds one status poll may spend waiting in total
+POLL_INTERVAL = 0.5      # seconds between status polls (2 Hz)
+MOVING_RATE = 0.2        # °/s of gyro yaw/pitch motion treated as tracking
+TEMPERATURE_MAX_AGE_NS = 500_000_000   # reuse a same-pixel reading this long
+
+# ANSI sequences used to redraw the monitor in place: cursor home, erase to
+# end of line (after each line) and erase below (after the last line), so a
+# shorter frame leaves nothing of the previous one without blanking the screen
+CURSOR_HOME = "\x1b[H"
+ERASE_LINE = "\x1b[K"
+ERASE_BELOW = "\x1b[J"
+
+# Kernel socket buffers, sized so bursts of auto-sent LRF/GPS frames are not
+# dropped. Linux caps them at net.core.rmem_max / wmem_max.
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Kernel receive timestamps: with SO_TIMESTAMPNS (Linux) each datagram carries
+# its arrival time as a struct timespec (CLOCK_REALTIME) in the ancillary
+# data. Python does not always export the constant, hence the Linux fallback.
+SO_TIMESTAMPNS = getattr(socket, 'SO_TIMESTAMPNS', 35 if sys.platform == 'linux' else None)
+_TIMESPEC = struct.Struct('@ll')
+
+# Attitude payload once hex-decoded: yaw, pitch, roll in 0.01° units
+_ATT_STRUCT = struct.Struct('>hhh')
+_INT16 = struct.Struct('>h')
+
+# LOC tracking payload: x, y, width, height, blur/click as int16
+_LOC_STRUCT = struct.Struct('>hhhhh')
+
+
+# Point temperature query: #tpPD6rTMP XXX YYY 0000 CRC (protocol 5.12.3).
+# Only the coordinates vary, so the fixed parts' byte sum is precomputed.
+_TMP_PREFIX = b"#tpPD6rTMP"
+_TMP_SUFFIX = b"0000"
+_TMP_FIXED_SUM = sum(_TMP_PREFIX) + sum(_TMP_SUFFIX)
+
+
+def _checksum(frame):
+    """Checksum suffix for a command frame: byte sum mod 256 as two hex digits"""
+    return b"%02X" % calculate_crc(frame)
+
+
+@lru_cache(maxsize=256)
+def _tmp_command(thermal_x, thermal_y):
+    """Point temperature query for thermal coordinates, CRC included"""
+    coords = b"%03d%03d" % (thermal_x, thermal_y)
+    crc = (_TMP_FIXED_SUM + sum(coords)) & 0xFF
+    return _TMP_PREFIX + coords + _TMP_SUFFIX + b"%02X" % crc
+
+
+def _parse_attitude(data, marker):
+    """
+    Decode a GAC/GIC attitude reply
+    
+    The payload after the marker is three 4-digit ASCII-hex signed 16-bit
+    values (yaw, pitch, roll) in 0.01° units.
+    
+    Args:
+        data: Received datagram (bytes), or None
+        marker: Reply identifier, b'GAC' or b'GIC'
+        
+    Returns:
+        {'yaw', 'pitch', 'roll'} in degrees, or None if data is missing,
+        has no marker or is too short
+        
+    Raises:
+        ValueError: If the payload contains non-hex characters
+    """
+    if data is None:
+        return None
+    idx = data.find(marker)
+    if idx == -1:
+        return None
+    idx += 3
+    if idx + 12 > len(data):
+        return None
+    
+    # 12 hex digits -> three signed big-endian int16s
+    yaw, pitch, roll = _ATT_STRUCT.unpack(binascii.unhexlify(data[idx:idx+12]))
+    return {
+        'yaw': yaw / 100.0,
+        'pitch': pitch / 100.0,
+        'roll': roll / 100.0
+    }
+
+
+@dataclass(slots=True)
+class TrackingState:
+    """Latest tracking information; angles are in degrees, None until received"""
+    is_tracking: bool = False
+    
+    # Target box in preview pixels
+    target_x: int = 0
+    target_y: int = 0
+    target_width: int = 0
+    target_height: int = 0
+    
+    # Target world position
+    target_lon: float = 0.0
+    target_lat: float = 0.0
+    target_distance: float = 0.0
+    target_temperature: float | None = None
+    
+    # Magnetic (fixed to mount) and gyroscope (absolute spatial) attitude
+    mag_yaw: float | None = None
+    mag_pitch: float | None = None
+    mag_roll: float | None = None
+    gyro_yaw: float | None = None
+    gyro_pitch: float | None = None
+    gyro_roll: float | None = None
+    
+    # Gyro angular velocity, °/s
+    yaw_rate: float | None = None
+    pitch_rate: float | None = None
+    
+    # Aircraft position
+    aircraft_lon: float = 0.0
+    aircraft_lat: float = 0.0
+    aircraft_alt: float = 0.0
+    
+    last_update_ns: int = 0   # time.monotonic_ns() of the last poll
+    poll_error: str | None = None   # Set when the latest poll failed
 
 
 class TrackingMonitor:
@@ -21,351 +160,439 @@ class TrackingMonitor:
         self.control_port = GIMBAL_CONFIG['control_port']
         self.listen_port = GIMBAL_CONFIG['listen_port']
         
-        # Sockets
+        # One socket for both directions: commands go out from the listen
+        # port and replies come back to it. It is not connect()ed because
+        # the camera's reply source port is not specified by the protocol.
+        self.camera_addr = (self.camera_ip, self.control_port)
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.recv_sock.bind(('0.0.0.0', self.listen_port))
-        self.recv_sock.settimeout(0.5)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        self.sock.bind(('0.0.0.0', self.listen_port))
+        
+        # The kernel may clamp (or, on Linux, double) the requested size
+        rcvbuf = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        sndbuf = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+        print(f"Socket buffers: receive {rcvbuf} bytes, send {sndbuf} bytes")
+        
+        # Stamp arrivals in the kernel when supported, so angular velocity
+        # is not skewed by how late this thread got to the datagram
+        self._ancbufsize = 0
+        if SO_TIMESTAMPNS is not None:
+            try:
+                self.sock.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+                self._ancbufsize = socket.CMSG_SPACE(_TIMESPEC.size)
+            except OSError:
+                pass
+        
+        # Non-blocking for good: waits go through the selector with a
+        # deadline kept in userspace instead of a per-call socket timeout
+        self.sock.setblocking(False)
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self.sock, selectors.EVENT_READ)
+        self._cycle_deadline = None   # set by check_tracking_status()
+        
+        # Reusable receive buffer; datagrams are copied out at their exact
+        # size (filed replies outlive the next receive)
+        self._rx = bytearray(1500)
+        self._mv = memoryview(self._rx)
+        
+        # Latest unconsumed datagram per reply identifier, and when the
+        # latest datagram for each identifier arrived (time.time_ns() clock)
+        self._responses = {}
+        self._arrival_ns = {}
         
         # Tracking data
-        self.tracking_data = {
-            'is_tracking': False,
-            'target_screen': {'x': 0, 'y': 0, 'width': 0, 'height': 0},
-            'target_world': {'lon': 0.0, 'lat': 0.0, 'distance': 0.0},
-            'gimbal_angles': {'magnetic': None, 'gyroscope': None},
-            'aircraft_position': {'lon': 0.0, 'lat': 0.0, 'alt': 0.0},
-            'last_update': None
-        }
+        self.tracking_data = TrackingState()
+        
+        # Gyro angles of the previous attitude poll (None if not received)
+        self._prev_gyro_yaw = None
+        self._prev_gyro_pitch = None
+        self._prev_gyro_roll = None
+        self._prev_gyro_ns = None  # Arrival time of the previous GIC reply
         
-        self.previous_angles = {}
+        # Last temperature reading: (thermal x, y), value, monotonic_ns
+        self._temp_xy = None
+        self._temp_value = None
+        self._temp_ns = 0
         
     def send_command(self, cmd_bytes):
         """Send command"""
-        self.sock.sendto(cmd_bytes, (self.camera_ip, self.control_port))
+        self.sock.sendto(cmd_bytes, self.camera_addr)
+        
+    def _receive(self):
+        """
+        Receive one datagram into the reusable buffer
+        
+        Returns:
+            (byte count, arrival time in ns) - the kernel timestamp when
+            available, otherwise the time of this call
+        """
+        if self._ancbufsize:
+            nbytes, ancdata, _, _ = self.sock.recvmsg_into([self._mv], self._ancbufsize)
+            for level, kind, cdata in ancdata:
+                if (level == socket.SOL_SOCKET and kind == SO_TIMESTAMPNS
+                        and len(cdata) >= _TIMESPEC.size):
+                    sec, nsec = _TIMESPEC.unpack_from(cdata)
+                    return nbytes, sec * 1_000_000_000 + nsec
+            return nbytes, time.time_ns()
+        return self.sock.recv_into(self._rx), time.time_ns()
+    
+    def _file_response(self, data, arrival_ns):
+        """Store a datagram under every reply identifier it carries"""
+        for marker in RESPONSE_MARKERS:
+            if marker in data:
+                self._responses[marker] = data
+                self._arrival_ns[marker] = arrival_ns
+    
+    def _drain_responses(self, max_msgs=8):
+        """Read every datagram already queued, without blocking, and file it by identifier"""
+        for _ in range(max_msgs):
+            try:
+                nbytes, arrival_ns = self._receive()
+            except OSError:
+                break  # Queue empty (BlockingIOError) or socket error
+            self._file_response(bytes(self._mv[:nbytes]), arrival_ns)
+        return self._responses
+    
+    def _request(self, cmd_bytes, marker, timeout=RESPONSE_TIMEOUT):
+        """
+        Send a command and wait for the reply carrying marker
+        
+        Returns:
+            Reply datagram, or None on timeout
+        """
+        return self._exchange(((cmd_bytes, marker),), timeout).get(marker)
+    
+    def _exchange(self, requests, timeout=RESPONSE_TIMEOUT):
+        """
+        Send several commands back to back, then collect their replies
+        
+        Other datagrams that arrive meanwhile (auto-sent LRF/GPS frames)
+        are filed for their own readers instead of being discarded.
+        
+        Args:
+            requests: Sequence of (command bytes, reply marker) pairs
+            timeout: Seconds to wait for all replies, further capped by
+                the remaining CYCLE_BUDGET while a status poll is running
+            
+        Returns:
+            Dict of marker -> reply datagram for the replies that arrived
+        """
+        pending = set()
+        for cmd_bytes, marker in requests:
+            self._responses.pop(marker, None)  # Drop any stale reply
+            self.send_command(cmd_bytes)
+            pending.add(marker)
         
+        replies = {}
+        deadline = time.monotonic() + timeout
+        if self._cycle_deadline is not None:
+            deadline = min(deadline, self._cycle_deadline)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._sel.select(remaining):
+                break
+            try:
+                nbytes, arrival_ns = self._receive()
+            except BlockingIOError:
+                continue  # Spurious wakeup
+            self._file_response(bytes(self._mv[:nbytes]), arrival_ns)
+            for marker in pending & self._responses.keys():
+                replies[marker] = self._responses.pop(marker)
+                pending.discard(marker)
+        return replies
+    
     def get_attitude(self):
         """Get gimbal attitude - both magnetic and gyroscope"""
         attitudes = {}
         
-        # Get magnetic attitude (GAC - protocol 4.3.3)
-        self.send_command(b"#TPPG2rGAC002D")
-        
+        # Query magnetic (GAC - protocol 4.3.3) and gyroscope (GIC -
+        # protocol 4.3.5) attitude together, then collect both replies
         try:
-            data, _ = self.recv_sock.recvfrom(1024)
-            resp_str = data.decode('ascii', errors='replace')
-            
-            if 'GAC' in resp_str:
-                idx = resp_str.find('GAC') + 3
-                if idx + 12 <= len(resp_str):
-                    yaw_hex = resp_str[idx:idx+4]
-                    pitch_hex = resp_str[idx+4:idx+8]
-                    roll_hex = resp_str[idx+8:idx+12]
-                    
-                    yaw = int(yaw_hex, 16)
-                    pitch = int(pitch_hex, 16)
-                    roll = int(roll_hex, 16)
-                    
-                    if yaw > 0x7FFF: yaw -= 0x10000
-                    if pitch > 0x7FFF: pitch -= 0x10000
-                    if roll > 0x7FFF: roll -= 0x10000
-                    
-                    attitudes['magnetic'] = {
-                        'yaw': yaw / 100.0,
-                        'pitch': pitch / 100.0,
-                        'roll': roll / 100.0
-                    }
-        except:
-            pass
-        
-        # Get gyroscope attitude (GIC - protocol 4.3.5)
-        self.send_command(b"#TPUG2rGIC003A")
+            replies = self._exchange(((CMD_GAC, b'GAC'), (CMD_GIC, b'GIC')))
+        except OSError:
+            return attitudes
+        
+        for marker, key in ((b'GAC', 'magnetic'), (b'GIC', 'gyroscope')):
+            try:
+                angles = _parse_attitude(replies.get(marker), marker)
+            except ValueError:
+                continue  # Corrupt hex digits
+            if angles is not None:
+                attitudes[key] = angles
         
-        try:
-            data, _ = self.recv_sock.recvfrom(1024)
-            resp_str = data.decode('ascii', errors='replace')
-            
-            if 'GIC' in resp_str:
-                idx = resp_str.find('GIC') + 3
-                if idx + 12 <= len(resp_str):
-                    yaw_hex = resp_str[idx:idx+4]
-                    pitch_hex = resp_str[idx+4:idx+8]
-                    roll_hex = resp_str[idx+8:idx+12]
-                    
-                    yaw = int(yaw_hex, 16)
-                    pitch = int(pitch_hex, 16)
-                    roll = int(roll_hex, 16)
-                    
-                    if yaw > 0x7FFF: yaw -= 0x10000
-                    if pitch > 0x7FFF: pitch -= 0x10000
-                    if roll > 0x7FFF: roll -= 0x10000
-                    
-                    attitudes['gyroscope'] = {
-                        'yaw': yaw / 100.0,
-                        'pitch': pitch / 100.0,
-                        'roll': roll / 100.0
-                    }
-        except:
-            pass
-            
         return attitudes
     
     def check_ranging_data(self):
         """Check if laser ranging data available (protocol 5.9)"""
-        # Try to get ranging data
-        # Note: Ranging data is auto-sent after measurement per protocol
-        try:
-            # Check for any pending ranging data
-            self.recv_sock.settimeout(0.1)
-            data, _ = self.recv_sock.recvfrom(1024)
-            resp_str = data.decode('ascii', errors='replace')
-            
-            if 'LRF' in resp_str and 'w' in resp_str:
-                # Found ranging data
-                idx = resp_str.find('LRF') + 3
-                if idx + 7 <= len(resp_str):
-                    range_str = resp_str[idx:idx+7]  # X1X2X3X4X5.X6 format
-                    if range_str[:3] != 'ERR':
-                        try:
-                            distance = float(range_str)
-                            self.tracking_data['target_world']['distance'] = distance
-                            return distance
-                        except:
-                            pass
-        except socket.timeout:
-            pass
+        # Ranging data is auto-sent after measurement per protocol, so
+        # pick it up from whatever is already queued
+        data = self._drain_responses().pop(b'LRF', None)
+        if data is None:
+            return None
+        
+        if b'w' in data:
+            # Found ranging data
+            idx = data.find(b'LRF') + 3
+            if idx + 7 <= len(data):
+                range_str = data[idx:idx+7]  # X1X2X3X4X5.X6 format
+                if range_str[:3] != b'ERR':
+                    try:
+                        distance = float(range_str)
+                        self.tracking_data.target_distance = distance
+                        return distance
+                    except ValueError:
+                        pass  # Not a number
         return None
     
     def check_temperature_at_target(self):
         """Check temperature at tracked position (protocol 5.12)"""
         # Only check if we have a tracked position
-        if not self.tracking_data['is_tracking']:
+        state = self.tracking_data
+        if not state.is_tracking:
             return None
             
-        target = self.tracking_data['target_screen']
-        if target['x'] == 0 and target['y'] == 0:
+        if state.target_x == 0 and state.target_y == 0:
             return None
         
         # Build temperature query command for target position
         # Using protocol 5.12.3 format for point temperature
-        x = target['x']
-        y = target['y']
+        x = state.target_x
+        y = state.target_y
         
         # Convert to thermal camera coordinates (320x256 per protocol)
         thermal_x = int(x * 320 / 1920)
         thermal_y = int(y * 256 / 1080)
         
-        # Build command: #tpPDArTMPXXXYYY WW HH
-        cmd_str = f"#tpPD6rTMP{thermal_x:03d}{thermal_y:03d}0000"
-        crc = sum(cmd_str.encode('ascii')) & 0xFF
-        cmd_str += f"{crc:02X}"
+        # The temperature at a fixed pixel does not change at the poll rate,
+        # so a recent reading for the same coordinates is reused
+        now_ns = time.monotonic_ns()
+        if ((thermal_x, thermal_y) == self._temp_xy
+                and now_ns - self._temp_ns < TEMPERATURE_MAX_AGE_NS):
+            return self._temp_value
         
-        self.send_command(cmd_str.encode('ascii'))
+        # Command is built once per unique thermal coordinate
+        data = self._request(_tmp_command(thermal_x, thermal_y), b'TMP')
+        if data is None:
+            return None
         
-        try:
-            data, _ = self.recv_sock.recvfrom(1024)
-            resp_str = data.decode('ascii', errors='replace')
-            
-            if 'TMP' in resp_str:
-                # Parse temperature response
-                idx = resp_str.find('TMP') + 3
-                if idx + 10 <= len(resp_str):
-                    # Skip coordinates, get temperature (last 4 chars)
-                    temp_hex = resp_str[idx+10:idx+14]
-                    try:
-                        temp_raw = int(temp_hex, 16)
-                        if temp_raw > 0x7FFF: temp_raw -= 0x10000
-                        temp_c = temp_raw / 100.0  # 0.01°C units
-                        return temp_c
-                    except:
-                        pass
-        except socket.timeout:
-            pass
+        # Parse temperature response
+        idx = data.find(b'TMP') + 3
+        if idx + 14 <= len(data):
+            # Skip coordinates, get temperature (last 4 chars)
+            temp_hex = data[idx+10:idx+14]
+            try:
+                temp_raw, = _INT16.unpack(binascii.unhexlify(temp_hex))
+                temp_c = temp_raw / 100.0  # 0.01°C units
+                self._temp_xy = (thermal_x, thermal_y)
+                self._temp_value = temp_c
+                self._temp_ns = now_ns
+                return temp_c
+            except ValueError:
+                pass  # Corrupt hex digits (binascii.Error)
         return None
     
     def parse_gps_data(self):
         """Parse GPS data if being sent (protocol 5.8)"""
         # GPS data might be sent automatically or we need to query
         # Check for any GPS data in receive buffer
-        try:
-            self.recv_sock.settimeout(0.1)
-            data, _ = self.recv_sock.recvfrom(1024)
-            resp_str = data.decode('ascii', errors='replace')
-            
-            # Check for longitude (LON)
-            if 'LON' in resp_str and 'w' in resp_str:
-                idx = resp_str.find('LON') + 3
-                if idx + 11 <= len(resp_str):
-                    ew = resp_str[idx]  # E or W
-                    lon_str = resp_str[idx+1:idx+11]  # ddd.dddddd
+        responses = self._drain_responses()
+        
+        # Check for longitude (LON)
+        data = responses.pop(b'LON', None)
+        if data is not None:
+            if b'w' in data:
+                idx = data.find(b'LON') + 3
+                if idx + 11 <= len(data):
+                    ew = data[idx]  # E or W (byte value)
+                    lon_str = data[idx+1:idx+11]  # ddd.dddddd
                     try:
                         lon = float(lon_str)
-                        if ew == 'W':
+                        if ew == 0x57:  # 'W'
                             lon = -lon
                         
                         # Check if it's target or aircraft position
                         # Target position is calculated, aircraft is raw GPS
-                        if 'target' in resp_str.lower():
-                            self.tracking_data['target_world']['lon'] = lon
+                        if b'target' in data.lower():
+                            self.tracking_data.target_lon = lon
                         else:
-                            self.tracking_data['aircraft_position']['lon'] = lon
-                    except:
-                        pass
-            
-            # Check for latitude (LAT)
-            if 'LAT' in resp_str and 'w' in resp_str:
-                idx = resp_str.find('LAT') + 3
-                if idx + 10 <= len(resp_str):
-                    ns = resp_str[idx]  # N or S
-                    lat_str = resp_str[idx+1:idx+10]  # dd.dddddd
+                            self.tracking_data.aircraft_lon = lon
+                    except ValueError:
+                        pass  # Not a number
+        
+        # Check for latitude (LAT)
+        data = responses.pop(b'LAT', None)
+        if data is not None:
+            if b'w' in data:
+                idx = data.find(b'LAT') + 3
+                if idx + 10 <= len(data):
+                    ns = data[idx]  # N or S (byte value)
+                    lat_str = data[idx+1:idx+10]  # dd.dddddd
                     try:
                         lat = float(lat_str)
-                        if ns == 'S':
+                        if ns == 0x53:  # 'S'
                             lat = -lat
                         
-                        if 'target' in resp_str.lower():
-                            self.tracking_data['target_world']['lat'] = lat
+                        if b'target' in data.lower():
+                            self.tracking_data.target_lat = lat
                         else:
-                            self.tracking_data['aircraft_position']['lat'] = lat
-                    except:
-                        pass
-                        
-        except socket.timeout:
-            pass
+                            self.tracking_data.aircraft_lat = lat
+                    except ValueError:
+                        pass  # Not a number
     
     def check_tracking_status(self):
         """Check if tracking is active and get target info"""
-        # First get gimbal attitudes (both types)
-        attitudes = self.get_attitude()
-        if attitudes:
-            self.tracking_data['gimbal_angles'] = attitudes
+        # All replies of this poll share one wait budget
+        self._cycle_deadline = time.monotonic() + CYCLE_BUDGET
+        try:
+            return self._check_tracking_status()
+        finally:
+            self._cycle_deadline = None
+    
+    def _check_tracking_status(self):
+        state = self.tracking_data
         
-        # Check for movement patterns that indicate tracking
-        # If gimbal is moving smoothly, it might be tracking
-        if hasattr(self, 'previous_angles') and 'gyroscope' in attitudes:
-            current = attitudes['gyroscope']
-            previous = self.previous_angles.get('gyroscope', current)
-            
-            # Calculate angular velocity
-            yaw_vel = abs(current['yaw'] - previous['yaw'])
-            pitch_vel = abs(current['pitch'] - previous['pitch'])
-            
-            # If gimbal is moving, might be tracking
-            if yaw_vel > 0.1 or pitch_vel > 0.1:
-                self.tracking_data['is_tracking'] = True
-                self.tracking_data['angular_velocity'] = {
-                    'yaw': yaw_vel,
-                    'pitch': pitch_vel
-                }
+        now_ns = time.monotonic_ns()
         
-        self.previous_angles = attitudes.copy() if attitudes else {}
+        # Gimbal attitudes and gyro angular velocity
+        self._update_attitude(state)
         
         # Check for ranging data (indicates active tracking with laser)
         distance = self.check_ranging_data()
         if distance is not None:
-            self.tracking_data['is_tracking'] = True
-            self.tracking_data['target_world']['distance'] = distance
+            state.is_tracking = True
+            state.target_distance = distance
         
         # Check for GPS data
         self.parse_gps_data()
         
         # Check temperature at target
-        if self.tracking_data['is_tracking']:
+        if state.is_tracking:
             temp = self.check_temperature_at_target()
             if temp is not None:
-                self.tracking_data['target_world']['temperature'] = temp
+                state.target_temperature = temp
         
-        # Update timestamp
-        self.tracking_data['last_update'] = datetime.now()
+        # Update timestamp (monotonic, ns)
+        state.last_update_ns = now_ns
         
-        return self.tracking_data
+        return state
+    
+    def _update_attitude(self, state):
+        """Query both attitudes and derive the gyro angular velocity"""
+        # First get gimbal attitudes (both types)
+        attitudes = self.get_attitude()
+        if attitudes:
+            mag = attitudes.get('magnetic')
+            gyro = attitudes.get('gyroscope')
+            state.mag_yaw, state.mag_pitch, state.mag_roll = (
+                (mag['yaw'], mag['pitch'], mag['roll']) if mag else (None, None, None))
+            state.gyro_yaw, state.gyro_pitch, state.gyro_roll = (
+                (gyro['yaw'], gyro['pitch'], gyro['roll']) if gyro else (None, None, None))
+        
+        # Check for movement patterns that indicate tracking
+        # If gimbal is moving smoothly, it might be tracking
+        current = attitudes.get('gyroscope')
+        stamp_ns = self._arrival_ns.get(b'GIC') if current is not None else None
+        if (stamp_ns is not None and self._prev_gyro_ns is not None
+                and stamp_ns > self._prev_gyro_ns):
+            # Calculate angular velocity in degrees per second between the
+            # arrivals of the two GIC replies
+            dt = (stamp_ns - self._prev_gyro_ns) * 1e-9
+            yaw_vel = abs(current['yaw'] - self._prev_gyro_yaw) / dt
+            pitch_vel = abs(current['pitch'] - self._prev_gyro_pitch) / dt
+            
+            # If gimbal is moving, might be tracking
+            if yaw_vel > MOVING_RATE or pitch_vel > MOVING_RATE:
+                state.is_tracking = True
+                state.yaw_rate = yaw_vel
+                state.pitch_rate = pitch_vel
+        
+        if current is not None:
+            self._prev_gyro_yaw = current['yaw']
+            self._prev_gyro_pitch = current['pitch']
+            self._prev_gyro_roll = current['roll']
+        else:
+            self._prev_gyro_yaw = self._prev_gyro_pitch = self._prev_gyro_roll = None
+        self._prev_gyro_ns = stamp_ns
+    
+    def display_tracking_info(self, data=None):
+        """Display tracking information (a snapshot, or the live tracking_data)"""
+        sys.stdout.write(self.format_tracking_info(data) + "\n")
     
-    def display_tracking_info(self):
-        """Display tracking information"""
-        print("\n" + "="*60)
-        print("TRACKING STATUS MONITOR")
-        print("="*60)
-        print(f"Time: {datetime.now().strftime('%H:%M:%S')}")
+    def format_tracking_info(self, data=None):
+        """Build the tracking display as one string, so it is written at once"""
+        out = ["", "="*60, "TRACKING STATUS MONITOR", "="*60,
+               f"Time: {datetime.now().strftime('%H:%M:%S')}"]
         
-        data = self.tracking_data
+        if data is None:
+            data = self.tracking_data
         
-        if data['is_tracking']:
-            print("\n[TRACKING ACTIVE]")
+        if data.poll_error is not None:
+            out += ["", f"[POLL FAILED] {data.poll_error}",
+                    "Values below are from the last successful poll"]
+        
+        if data.is_tracking:
+            out += ["", "[TRACKING ACTIVE]"]
             
             # Angular velocity if available
-            if 'angular_velocity' in data:
-                vel = data['angular_velocity']
-                print(f"Angular velocity: Yaw={vel['yaw']:.2f}°/update Pitch={vel['pitch']:.2f}°/update")
+            if data.yaw_rate is not None:
+                out.append(f"Angular velocity: Yaw={data.yaw_rate:.2f}°/s Pitch={data.pitch_rate:.2f}°/s")
             
             # Target screen position
-            target = data['target_screen']
-            if target['x'] > 0 or target['y'] > 0:
-                print(f"\nTarget Screen Position:")
-                print(f"  Position: ({target['x']}, {target['y']})")
-                print(f"  Size: {target['width']}x{target['height']}")
+            if data.target_x > 0 or data.target_y > 0:
+                out += ["", "Target Screen Position:",
+                        f"  Position: ({data.target_x}, {data.target_y})",
+                        f"  Size: {data.target_width}x{data.target_height}"]
             
             # Gimbal angles - both types
-            angles = data['gimbal_angles']
-            if 'magnetic' in angles:
-                mag = angles['magnetic']
-                print(f"\nMagnetic Angles (Fixed to mount):")
-                print(f"  Yaw:   {mag['yaw']:7.2f}°")
-                print(f"  Pitch: {mag['pitch']:7.2f}°")
-                print(f"  Roll:  {mag['roll']:7.2f}°")
-            
-            if 'gyroscope' in angles:
-                gyro = angles['gyroscope']
-                print(f"\nGyroscope Angles (Absolute spatial):")
-                print(f"  Yaw:   {gyro['yaw']:7.2f}°")
-                print(f"  Pitch: {gyro['pitch']:7.2f}°")
-                print(f"  Roll:  {gyro['roll']:7.2f}°")
+            self._format_angles(data, out)
             
             # Show difference between angle types
-            if 'magnetic' in angles and 'gyroscope' in angles:
-                mag = angles['magnetic']
-                gyro = angles['gyroscope']
-                print(f"\nAngle Difference (Gyro - Magnetic):")
-                print(f"  Yaw:   {gyro['yaw'] - mag['yaw']:7.2f}°")
-                print(f"  Pitch: {gyro['pitch'] - mag['pitch']:7.2f}°")
-                print(f"  Roll:  {gyro['roll'] - mag['roll']:7.2f}°")
+            if data.mag_yaw is not None and data.gyro_yaw is not None:
+                out += ["", "Angle Difference (Gyro - Magnetic):",
+                        f"  Yaw:   {data.gyro_yaw - data.mag_yaw:7.2f}°",
+                        f"  Pitch: {data.gyro_pitch - data.mag_pitch:7.2f}°",
+                        f"  Roll:  {data.gyro_roll - data.mag_roll:7.2f}°"]
             
             # Target world position
-            world = data['target_world']
-            if world['distance'] > 0:
-                print(f"\nTarget World Info:")
-                print(f"  Distance: {world['distance']:.1f} m")
+            if data.target_distance > 0:
+                out += ["", "Target World Info:",
+                        f"  Distance: {data.target_distance:.1f} m"]
                 
-                if world['lat'] != 0 or world['lon'] != 0:
-                    print(f"  GPS: {world['lat']:.6f}°, {world['lon']:.6f}°")
+                if data.target_lat != 0 or data.target_lon != 0:
+                    out.append(f"  GPS: {data.target_lat:.6f}°, {data.target_lon:.6f}°")
                 
-                if 'temperature' in world:
-                    print(f"  Temperature: {world['temperature']:.1f}°C")
+                if data.target_temperature is not None:
+                    out.append(f"  Temperature: {data.target_temperature:.1f}°C")
             
             # Aircraft position
-            aircraft = data['aircraft_position']
-            if aircraft['lat'] != 0 or aircraft['lon'] != 0:
-                print(f"\nAircraft Position:")
-                print(f"  GPS: {aircraft['lat']:.6f}°, {aircraft['lon']:.6f}°")
-                print(f"  Altitude: {aircraft['alt']:.1f} m")
+            if data.aircraft_lat != 0 or data.aircraft_lon != 0:
+                out += ["", "Aircraft Position:",
+                        f"  GPS: {data.aircraft_lat:.6f}°, {data.aircraft_lon:.6f}°",
+                        f"  Altitude: {data.aircraft_alt:.1f} m"]
                 
         else:
-            print("\n[NO ACTIVE TRACKING]")
-            print("Tip: Use manual_tracking_control.py to start tracking")
+            out += ["", "[NO ACTIVE TRACKING]",
+                    "Tip: Use manual_tracking_control.py to start tracking"]
             
             # Still show gimbal angles
-            angles = data['gimbal_angles']
-            if 'magnetic' in angles:
-                mag = angles['magnetic']
-                print(f"\nMagnetic Angles (Fixed to mount):")
-                print(f"  Yaw:   {mag['yaw']:7.2f}°")
-                print(f"  Pitch: {mag['pitch']:7.2f}°")
-                print(f"  Roll:  {mag['roll']:7.2f}°")
-            
-            if 'gyroscope' in angles:
-                gyro = angles['gyroscope']
-                print(f"\nGyroscope Angles (Absolute spatial):")
-                print(f"  Yaw:   {gyro['yaw']:7.2f}°")
-                print(f"  Pitch: {gyro['pitch']:7.2f}°")
-                print(f"  Roll:  {gyro['roll']:7.2f}°")
+            self._format_angles(data, out)
+        
+        return "\n".join(out)
+    
+    def _format_angles(self, data, out):
+        """Append the magnetic and gyroscope angles that have been received"""
+        if data.mag_yaw is not None:
+            out += ["", "Magnetic Angles (Fixed to mount):",
+                    f"  Yaw:   {data.mag_yaw:7.2f}°",
+                    f"  Pitch: {data.mag_pitch:7.2f}°",
+                    f"  Roll:  {data.mag_roll:7.2f}°"]
+        
+        if data.gyro_yaw is not None:
+            out += ["", "Gyroscope Angles (Absolute spatial):",
+                    f"  Yaw:   {data.gyro_yaw:7.2f}°",
+                    f"  Pitch: {data.gyro_pitch:7.2f}°",
+                    f"  Roll:  {data.gyro_roll:7.2f}°"]
     
     def monitor_continuously(self):
         """Monitor tracking status continuously"""
@@ -374,22 +601,72 @@ class TrackingMonitor:
         print("\nNote: Tracking must be initiated from camera's native app")
         print("This monitor will detect and report active tracking\n")
         
+        # Socket polling runs in a worker thread; this thread only renders,
+        # so a missed reply never delays the redraw
+        snapshots = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        failure = []   # Unexpected exception that ended the poller
+        poller = threading.Thread(target=self._poll_loop,
+                                  args=(snapshots, stop, failure), daemon=True)
+        poller.start()
+        
+        data = None
         try:
             while True:
-                self.check_tracking_status()
+                try:
+                    data = snapshots.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    if failure:
+                        # Stop here rather than repaint frozen data as live
+                        raise failure[0] from None
+                    if data is None:
+                        continue  # Nothing polled yet
                 
-                # Clear screen and display
-                import os
-                os.system('cls' if os.name == 'nt' else 'clear')
-                self.display_tracking_info()
-                
-                time.sleep(0.5)  # Update at 2Hz
+                # Overwrite the previous frame in place with a single write
+                frame = self.format_tracking_info(data)
+                sys.stdout.write(CURSOR_HOME
+                                 + frame.replace("\n", ERASE_LINE + "\n")
+                                 + ERASE_LINE + "\n" + ERASE_BELOW)
+                sys.stdout.flush()
                 
         except KeyboardInterrupt:
             print("\n\nMonitoring stopped.")
         finally:
+            stop.set()
+            poller.join(timeout=CYCLE_BUDGET + POLL_INTERVAL)
+            self._sel.close()
             self.sock.close()
-            self.recv_sock.close()
+    
+    def _poll_loop(self, snapshots, stop, failure):
+        """
+        Poll the camera every POLL_INTERVAL and publish the latest snapshot
+        
+        A socket error fails only the current poll: the snapshot carries it
+        in poll_error so the display marks its values as stale. Any other
+        exception ends polling and is handed to the render loop via failure.
+        """
+        try:
+            while not stop.is_set():
+                started = time.monotonic()
+                try:
+                    self.check_tracking_status()
+                    error = None
+                except OSError as e:
+                    error = f"{type(e).__name__}: {e}"
+                snapshot = copy.copy(self.tracking_data)  # Fields are immutable
+                snapshot.poll_error = error
+                
+                # Keep only the newest snapshot for the renderer
+                try:
+                    snapshots.get_nowait()
+                except queue.Empty:
+                    pass
+                snapshots.put_nowait(snapshot)
+                
+                # Next poll starts on schedule rather than a fixed sleep later
+                stop.wait(max(0.0, POLL_INTERVAL - (time.monotonic() - started)))
+        except Exception as e:
+            failure.append(e)
     
     def test_tracking_simulation(self):
         """Simulate tracking by sending LOC command"""
@@ -407,23 +684,23 @@ class TrackingMonitor:
         blur_click = 8
         
         # Pack data
-        vals = (param_x, param_y, param_w, param_h, blur_click)
-        data_bytes = b''.join(struct.pack('>h', v) for v in vals)
+        data_bytes = _LOC_STRUCT.pack(param_x, param_y, param_w, param_h, blur_click)
         data_hex = data_bytes.hex().upper()
         
         # Build command
         data_len = len(data_bytes)
-        cmd = f"#tpPD{data_len:X}wLOC" + data_hex
-        crc = sum(cmd.encode('ascii')) & 0xFF
-        cmd += f"{crc:02X}"
+        cmd = f"#tpPD{data_len:X}wLOC{data_hex}".encode('ascii')
+        cmd += _checksum(cmd)
         
-        print(f"Sending LOC command: {cmd}")
+        print(f"Sending LOC command: {cmd.decode('ascii')}")
         print(f"Target: ({x},{y}) Size: {width}x{height}")
-        self.send_command(cmd.encode('ascii'))
+        self.send_command(cmd)
         
         # Update tracking data
-        self.tracking_data['is_tracking'] = True
-        self.tracking_data['target_screen'] = {'x': x, 'y': y, 'width': width, 'height': height}
+        state = self.tracking_data
+        state.is_tracking = True
+        state.target_x, state.target_y = x, y
+        state.target_width, state.target_height = width, height
         
         print("Manual tracking started at center of screen.")
         print("Note: The gimbal should now be tracking this position.")
@@ -5,10 +5,67 @@ Quick Gimbal Unlock
 Unlock gimbal and prepare for control.
 """
 
+import select
 import socket
 import time
 from config import GIMBAL_CONFIG
 
+# Fixed commands (CRC included)
+CMD_PTZ_FOLLOW = b"#TPUG2wPTZ076E"   # Set follow mode
+CMD_PTZ_LOCK = b"#TPUG2wPTZ0870"     # Lock/follow switch
+CMD_GAA_ENABLE = b"#TPUG2wGAA0136"   # Enable attitude sending
+CMD_PTZ_HOME = b"#TPUG2wPTZ056F"     # Go to home position
+CMD_PTZ_LEFT = b"#TPUG2wPTZ036D"     # Move left
+CMD_PTZ_STOP = b"#TPUG2wPTZ006A"     # Stop
+CMD_GAC = b"#TPPG2rGAC002D"          # Read magnetic attitude
+
+# Kernel socket buffers (Linux caps them at net.core.rmem_max / wmem_max)
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Seconds to wait for the reply to each unlock command
+UNLOCK_REPLY_WAIT = 1.0
+
+# Seconds to let the gimbal finish homing after the ack; the ack only
+# confirms the command was accepted, not that the motion is done
+HOME_SETTLE_TIME = 1.5
+
+# (description, command, extra settle time after the reply)
+UNLOCK_SEQUENCE = (
+    ("1. Set follow mode", CMD_PTZ_FOLLOW, 0.0),
+    ("2. Lock/follow switch", CMD_PTZ_LOCK, 0.0),
+    ("3. Enable attitude sending", CMD_GAA_ENABLE, 0.0),
+    ("4. Go to home position", CMD_PTZ_HOME, HOME_SETTLE_TIME),
+)
+
+
+def _collect_replies(recv_sock, commands, timeout):
+    """
+    Wait up to timeout seconds for replies to a batch of commands
+    
+    Replies are matched to commands by identifier (PTZ, GAA, ...); several
+    commands with the same identifier take their replies in send order.
+    
+    Returns:
+        List with the reply datagram (or None) for each command
+    """
+    replies = [None] * len(commands)
+    pending = {}
+    for i, cmd in enumerate(commands):
+        pending.setdefault(cmd[7:10], []).append(i)
+    
+    deadline = time.monotonic() + timeout
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([recv_sock], [], [], remaining)[0]:
+            break
+        data, _ = recv_sock.recvfrom(1024)
+        waiting = pending.get(data[7:10])
+        if waiting:
+            replies[waiting.pop(0)] = data
+            if not waiting:
+                del pending[data[7:10]]
+    return replies
+
 
 def unlock_gimbal():
     """Try various methods to unlock gimbal"""
@@ -16,57 +73,57 @@ def unlock_gimbal():
     print("="*50)
     print("This will try to unlock the gimbal for control.\n")
     
+    camera = (GIMBAL_CONFIG['camera_ip'], GIMBAL_CONFIG['control_port'])
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
     recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
     recv_sock.bind(('0.0.0.0', GIMBAL_CONFIG['listen_port']))
     recv_sock.settimeout(1.0)
     
-    # Unlock sequence
-    commands = [
-        ("1. Set follow mode", b"#TPUG2wPTZ076E"),
-        ("2. Lock/follow switch", b"#TPUG2wPTZ0870"),
-        ("3. Enable attitude sending", b"#TPUG2wGAA0136"),
-        ("4. Go to home position", b"#TPUG2wPTZ056F"),
-    ]
-    
-    for desc, cmd in commands:
+    # Unlock sequence: each command waits for its reply (up to
+    # UNLOCK_REPLY_WAIT) instead of a fixed delay, so mode changes are
+    # applied one at a time; homing additionally gets time to complete
+    for desc, cmd, settle in UNLOCK_SEQUENCE:
         print(f"\n{desc}...")
-        sock.sendto(cmd, (GIMBAL_CONFIG['camera_ip'], GIMBAL_CONFIG['control_port']))
+        sock.sendto(cmd, camera)
         
-        try:
-            data, _ = recv_sock.recvfrom(1024)
+        data, = _collect_replies(recv_sock, [cmd], UNLOCK_REPLY_WAIT)
+        if data is not None:
             print(f"  Response: {data.decode('ascii', errors='replace')}")
-        except socket.timeout:
+        else:
             print("  No response")
         
-        time.sleep(1.0)
+        if settle:
+            time.sleep(settle)
     
     # Test if unlocked by checking attitude
     print("\n5. Testing if gimbal responds...")
-    sock.sendto(b"#TPPG2rGAC002D", (GIMBAL_CONFIG['camera_ip'], GIMBAL_CONFIG['control_port']))
     
-    try:
-        data, _ = recv_sock.recvfrom(1024)
+    # Late acks and auto-sent frames must not be taken as the GAC reply:
+    # drop what is queued, then wait for a frame carrying GAC
+    while select.select([recv_sock], [], [], 0)[0]:
+        recv_sock.recvfrom(1024)
+    sock.sendto(CMD_GAC, camera)
+    data, = _collect_replies(recv_sock, [CMD_GAC], UNLOCK_REPLY_WAIT)
+    
+    if data is not None:
         response = data.decode('ascii', errors='replace')
-        if 'GAC' in response:
-            print(f"  ✓ Gimbal is responding! Response: {response}")
-            
-            # Test movement
-            print("\n6. Testing movement...")
-            sock.sendto(b"#TPUG2wPTZ036D", (GIMBAL_CONFIG['camera_ip'], GIMBAL_CONFIG['control_port']))
-            print("  Sent LEFT command")
-            time.sleep(1.0)
-            
-            sock.sendto(b"#TPUG2wPTZ006A", (GIMBAL_CONFIG['camera_ip'], GIMBAL_CONFIG['control_port']))
-            print("  Sent STOP command")
-            
-            print("\n✓ Gimbal should be unlocked now!")
-            print("  Try running other scripts to control it.")
-            
-        else:
-            print("  ✗ Invalid response")
-            
-    except socket.timeout:
+        print(f"  ✓ Gimbal is responding! Response: {response}")
+        
+        # Test movement
+        print("\n6. Testing movement...")
+        sock.sendto(CMD_PTZ_LEFT, camera)
+        print("  Sent LEFT command")
+        time.sleep(1.0)
+        
+        sock.sendto(CMD_PTZ_STOP, camera)
+        print("  Sent STOP command")
+        
+        print("\n✓ Gimbal should be unlocked now!")
+        print("  Try running other scripts to control it.")
+        
+    else:
         print("  ✗ No response - gimbal may still be locked")
     
     sock.close()